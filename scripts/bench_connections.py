@@ -0,0 +1,98 @@
+"""
+Benchmark connection reuse: new connections (TCP + TLS handshakes) and request latency at various concurrency levels,
+with the old hard-coded pool limits vs. a `ConnectionProfile`.
+
+Runs against a local HTTP/1.1 server that delays every new connection by `--handshake` seconds, the cost of
+a TLS handshake to twitter.com. With `--url`, a real endpoint is used instead, and HTTP/2 is compared as well
+if the `h2` package is installed.
+
+usage: python bench_connections.py [--per-worker N] [--handshake SECONDS] [--latency SECONDS] [--url URL]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import AsyncClient, Limits
+
+from twitter_api_client.connection import HTTP2, ConnectionProfile
+
+CONCURRENCY = [1, 10, 50, 100, 200]
+BODY = b'{"data":{}}'
+
+
+async def serve(handshake: float, latency: float) -> tuple[asyncio.Server, str]:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await asyncio.sleep(handshake)
+        try:
+            while (head := await reader.readuntil(b'\r\n\r\n')):
+                await asyncio.sleep(latency)
+                writer.write(b'HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n'
+                             b'content-length: %d\r\n\r\n%s' % (len(BODY), BODY))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            ...
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    return server, f'http://{host}:{port}/'
+
+
+async def run(client_kwargs: dict, url: str, concurrency: int, requests: int) -> tuple[int, list[float], float, float]:
+    connections = 0
+    latencies = []
+
+    async def trace(event: str, info: dict):
+        nonlocal connections
+        if event == 'connection.connect_tcp.complete':
+            connections += 1
+
+    async def worker(n: int):
+        for _ in range(n):
+            start = time.perf_counter()
+            r = await client.get(url, extensions={'trace': trace})
+            await r.aread()
+            latencies.append(time.perf_counter() - start)
+
+    async with AsyncClient(**client_kwargs) as client:
+        start, cpu = time.perf_counter(), time.process_time()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        wall, cpu = time.perf_counter() - start, time.process_time() - cpu
+    return connections, latencies, wall, cpu
+
+
+async def main(args):
+    profiles = {
+        'old (100/10, h1.1)': {'limits': Limits(max_connections=100, max_keepalive_connections=10), 'timeout': 20},
+        'ConnectionProfile': ConnectionProfile(http2=False).client_kwargs(),
+    }
+    server = None
+    if url := args.url:
+        if HTTP2:
+            profiles['ConnectionProfile h2'] = ConnectionProfile(http2=True).client_kwargs()
+    else:
+        server, url = await serve(args.handshake, args.latency)
+    for concurrency in CONCURRENCY:
+        for name, client_kwargs in profiles.items():
+            requests = max(100, concurrency * args.per_worker)
+            connections, latencies, wall, cpu = await run(client_kwargs, url, concurrency, requests)
+            latencies.sort()
+            print(f'concurrency: {concurrency:<4} {name:<22} '
+                  f'connections: {connections:>5}/{len(latencies):<5} '
+                  f'mean: {statistics.mean(latencies) * 1e3:>7.1f} ms   '
+                  f'p95: {latencies[int(len(latencies) * .95)] * 1e3:>7.1f} ms   '
+                  f'wall: {wall:>6.2f} s   '
+                  f'cpu: {cpu / len(latencies) * 1e3:>6.2f} ms/request', flush=True)
+    if server:
+        server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--per-worker', type=int, default=10, help='sequential requests per concurrent worker')
+    parser.add_argument('--handshake', type=float, default=0.1, help='simulated seconds to set up a connection')
+    parser.add_argument('--latency', type=float, default=0.05, help='simulated seconds per response')
+    parser.add_argument('--url', help='benchmark against a real endpoint instead of the local server')
+    asyncio.run(main(parser.parse_args()))
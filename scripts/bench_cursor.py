@@ -0,0 +1,34 @@
+"""
+Benchmark cursor extraction per page: targeted instruction lookup vs. searching the whole response.
+
+usage: python bench_cursor.py [recorded pages or directories ...]
+"""
+import sys
+import timeit
+
+from bench_fixtures import default_pages, load_pages
+from twitter_api_client.util import find_cursor, get_cursor
+
+
+def bench(name: str, pages: list[dict], number: int = 20) -> None:
+    for page in pages:
+        assert get_cursor(page) == find_cursor(page) or find_cursor(page) is None, 'cursor mismatch'
+    fast = min(timeit.repeat(lambda: [get_cursor(p) for p in pages], number=number, repeat=5))
+    slow = min(timeit.repeat(lambda: [find_cursor(p) for p in pages], number=number, repeat=5))
+    per_page = lambda t: t / (number * len(pages)) * 1e6
+    print(f'{name:<12} pages: {len(pages):<5} '
+          f'full search: {per_page(slow):>9.1f} us/page   '
+          f'targeted: {per_page(fast):>7.1f} us/page   '
+          f'saved: {per_page(slow - fast):>9.1f} us/page ({slow / fast:.0f}x)')
+
+
+def main():
+    if paths := sys.argv[1:]:
+        bench('recorded', load_pages(paths))
+    else:
+        for name, pages in default_pages().items():
+            bench(name, pages)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark of key extraction: the previous recursive `find_key` helper, called once per key,
+vs. the single-pass `find_keys`.
+
+usage: python bench_find_keys.py [recorded pages or directories ...]
+"""
+import sys
+import timeit
+
+from bench_fixtures import default_pages, load_pages
+from twitter_api_client.util import find_keys
+
+KEYS = ('rest_id', 'entries')
+
+
+def find_key_recursive(obj: any, key: str) -> list:
+    # previous implementation, kept here as the baseline
+    def helper(obj: any, key: str, L: list) -> list:
+        if not obj:
+            return L
+
+        if isinstance(obj, list):
+            for e in obj:
+                L.extend(helper(e, key, []))
+            return L
+
+        if isinstance(obj, dict) and obj.get(key):
+            L.append(obj[key])
+
+        if isinstance(obj, dict) and obj:
+            for k in obj:
+                L.extend(helper(obj[k], key, []))
+        return L
+
+    return helper(obj, key, [])
+
+
+def bench(name: str, pages: list[dict], number: int = 10) -> None:
+    for page in pages:
+        found = find_keys(page, KEYS)
+        assert all(found[k] == find_key_recursive(page, k) for k in KEYS), 'result mismatch'
+    recursive = min(timeit.repeat(lambda: [find_key_recursive(p, k) for p in pages for k in KEYS],
+                                  number=number, repeat=5))
+    single = min(timeit.repeat(lambda: [find_keys(p, KEYS) for p in pages], number=number, repeat=5))
+    per_page = lambda t: t / (number * len(pages)) * 1e6
+    print(f'{name:<12} keys: {",".join(KEYS)}   '
+          f'recursive x{len(KEYS)}: {per_page(recursive):>8.1f} us/page   '
+          f'find_keys: {per_page(single):>8.1f} us/page   '
+          f'speedup: {recursive / single:.1f}x')
+
+
+def main():
+    if paths := sys.argv[1:]:
+        bench('recorded', load_pages(paths))
+    else:
+        for name, pages in default_pages().items():
+            bench(name, pages)
+
+
+if __name__ == '__main__':
+    main()
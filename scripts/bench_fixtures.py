@@ -0,0 +1,262 @@
+"""
+Synthetic payloads shaped like recorded `UserTweets`, `Followers` and search (`adaptive.json`) pages.
+
+Used by the benchmarks in this directory when no recorded pages are given on the command line.
+Recorded pages can be produced with `Scraper(save=True)`, which writes one JSON file per page under `data/`.
+"""
+import random
+from pathlib import Path
+
+import orjson
+
+SOURCES = [
+    '<a href="http://twitter.com/download/iphone" rel="nofollow">Twitter for iPhone</a>',
+    '<a href="http://twitter.com/download/android" rel="nofollow">Twitter for Android</a>',
+    '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>',
+]
+LANGS = ['en', 'en', 'en', 'es', 'ja', 'pt', 'und']
+DATES = ['Wed Oct 10 20:19:24 +0000 2018', 'Mon Jan 02 08:00:01 +0000 2023', 'Fri Jun 16 13:45:59 +0000 2023']
+
+
+def user_result(user_id: int, rng: random.Random) -> dict:
+    return {
+        '__typename': 'User',
+        'id': f'VXNlcjo{user_id}',
+        'rest_id': str(user_id),
+        'affiliates_highlighted_label': {},
+        'has_graduated_access': True,
+        'is_blue_verified': rng.random() < 0.1,
+        'profile_image_shape': 'Circle',
+        'legacy': {
+            'can_dm': False,
+            'can_media_tag': True,
+            'created_at': rng.choice(DATES),
+            'default_profile': False,
+            'default_profile_image': False,
+            'description': f'bio of user {user_id} https://t.co/abc{user_id}',
+            'entities': {
+                'description': {'urls': [{
+                    'display_url': f'example.com/{user_id}',
+                    'expanded_url': f'https://example.com/{user_id}',
+                    'url': f'https://t.co/abc{user_id}',
+                    'indices': [20, 43],
+                }]},
+                'url': {'urls': [{
+                    'display_url': 'example.com',
+                    'expanded_url': 'https://example.com',
+                    'url': 'https://t.co/xyz',
+                    'indices': [0, 23],
+                }]},
+            },
+            'fast_followers_count': 0,
+            'favourites_count': rng.randrange(10_000),
+            'followers_count': rng.randrange(1_000_000),
+            'friends_count': rng.randrange(5_000),
+            'has_custom_timelines': True,
+            'is_translator': False,
+            'listed_count': rng.randrange(1_000),
+            'location': 'Earth',
+            'media_count': rng.randrange(1_000),
+            'name': f'User {user_id}',
+            'normal_followers_count': rng.randrange(1_000_000),
+            'pinned_tweet_ids_str': [],
+            'possibly_sensitive': False,
+            'profile_banner_url': f'https://pbs.twimg.com/profile_banners/{user_id}/1',
+            'profile_image_url_https': f'https://pbs.twimg.com/profile_images/{user_id}/a_normal.jpg',
+            'profile_interstitial_type': '',
+            'screen_name': f'user{user_id}',
+            'statuses_count': rng.randrange(100_000),
+            'translator_type': 'none',
+            'url': 'https://t.co/xyz',
+            'verified': False,
+            'withheld_in_countries': [],
+        },
+    }
+
+
+def media(media_id: int) -> dict:
+    return {
+        'display_url': 'pic.twitter.com/abc',
+        'expanded_url': f'https://twitter.com/i/status/{media_id}/photo/1',
+        'id_str': str(media_id),
+        'indices': [40, 63],
+        'media_url_https': f'https://pbs.twimg.com/media/{media_id}.jpg',
+        'type': 'photo',
+        'url': 'https://t.co/media',
+        'features': {'large': {'faces': []}, 'orig': {'faces': []}},
+        'sizes': {k: {'h': 1080, 'w': 1920, 'resize': 'fit'} for k in ('large', 'medium', 'small', 'thumb')},
+        'original_info': {'height': 1080, 'width': 1920, 'focus_rects': []},
+        'ext_media_availability': {'status': 'Available'},
+    }
+
+
+def tweet_result(tweet_id: int, user: dict, rng: random.Random, quote: dict = None) -> dict:
+    has_media = rng.random() < 0.3
+    text = f'tweet {tweet_id} with a link https://t.co/l{tweet_id}' + (' https://t.co/media' if has_media else '')
+    legacy = {
+        'bookmark_count': rng.randrange(100),
+        'bookmarked': False,
+        'created_at': rng.choice(DATES),
+        'conversation_id_str': str(tweet_id),
+        'display_text_range': [0, len(text)],
+        'entities': {
+            'hashtags': [],
+            'symbols': [],
+            'user_mentions': [],
+            'urls': [{
+                'display_url': f'example.com/{tweet_id}',
+                'expanded_url': f'https://example.com/{tweet_id}',
+                'url': f'https://t.co/l{tweet_id}',
+                'indices': [29, 52],
+            }],
+        },
+        'favorite_count': rng.randrange(10_000),
+        'favorited': False,
+        'full_text': text,
+        'is_quote_status': quote is not None,
+        'lang': rng.choice(LANGS),
+        'possibly_sensitive': False,
+        'quote_count': rng.randrange(100),
+        'reply_count': rng.randrange(100),
+        'retweet_count': rng.randrange(1_000),
+        'retweeted': False,
+        'user_id_str': user['rest_id'],
+        'id_str': str(tweet_id),
+        'source': rng.choice(SOURCES),
+    }
+    if has_media:
+        legacy['entities']['media'] = [media(tweet_id)]
+        legacy['extended_entities'] = {'media': [media(tweet_id)]}
+    result = {
+        '__typename': 'Tweet',
+        'rest_id': str(tweet_id),
+        'core': {'user_results': {'result': user}},
+        'edit_control': {'edit_tweet_ids': [str(tweet_id)], 'editable_until_msecs': '0', 'is_edit_eligible': False},
+        'is_translatable': False,
+        'views': {'count': str(rng.randrange(1_000_000)), 'state': 'EnabledWithCount'},
+        'source': legacy['source'],
+        'legacy': legacy,
+    }
+    if quote:
+        legacy['quoted_status_id_str'] = quote['rest_id']
+        result['quoted_status_result'] = {'result': quote}
+    return result
+
+
+def cursor_entries(cursor: str) -> list[dict]:
+    return [
+        {'entryId': f'cursor-top-{cursor}', 'sortIndex': '0', 'content': {
+            'entryType': 'TimelineTimelineCursor', '__typename': 'TimelineTimelineCursor',
+            'value': f'top-{cursor}', 'cursorType': 'Top'}},
+        {'entryId': f'cursor-bottom-{cursor}', 'sortIndex': '0', 'content': {
+            'entryType': 'TimelineTimelineCursor', '__typename': 'TimelineTimelineCursor',
+            'value': cursor, 'cursorType': 'Bottom'}},
+    ]
+
+
+def user_tweets_page(n: int = 20, cursor: str = 'DAABCgABF', seed: int = 0, author: int = 44196397) -> dict:
+    """
+    A `UserTweets` page of `n` tweets by a single author, some quoting other users.
+    """
+    rng = random.Random(seed)
+    user = user_result(author, rng)
+    entries = []
+    for i in range(n):
+        tweet_id = 1_600_000_000_000_000_000 + seed * 1_000 + i
+        quote = None
+        if rng.random() < 0.2:
+            quote = tweet_result(tweet_id - 500, user_result(rng.randrange(10 ** 9), rng), rng)
+        entries.append({
+            'entryId': f'tweet-{tweet_id}',
+            'sortIndex': str(tweet_id),
+            'content': {
+                'entryType': 'TimelineTimelineItem',
+                '__typename': 'TimelineTimelineItem',
+                'itemContent': {
+                    'itemType': 'TimelineTweet',
+                    '__typename': 'TimelineTweet',
+                    'tweet_results': {'result': tweet_result(tweet_id, user, rng, quote)},
+                    'tweetDisplayType': 'Tweet',
+                },
+            },
+        })
+    if cursor:
+        entries.extend(cursor_entries(cursor))
+    return {'data': {'user': {'result': {'__typename': 'User', 'timeline_v2': {'timeline': {'instructions': [
+        {'type': 'TimelineClearCache'},
+        {'type': 'TimelineAddEntries', 'entries': entries},
+    ]}}}}}}
+
+
+def followers_page(n: int = 50, cursor: str = '1767341853908517597|1663601806447476672', seed: int = 0) -> dict:
+    """
+    A `Followers` page of `n` users.
+    """
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        user_id = 10 ** 9 + seed * 1_000 + i
+        entries.append({
+            'entryId': f'user-{user_id}',
+            'sortIndex': str(user_id),
+            'content': {
+                'entryType': 'TimelineTimelineItem',
+                '__typename': 'TimelineTimelineItem',
+                'itemContent': {
+                    'itemType': 'TimelineUser',
+                    '__typename': 'TimelineUser',
+                    'user_results': {'result': user_result(user_id, rng)},
+                    'userDisplayType': 'User',
+                },
+            },
+        })
+    if cursor:
+        entries.extend(cursor_entries(cursor))
+    return {'data': {'user': {'result': {'__typename': 'User', 'timeline': {'timeline': {'instructions': [
+        {'type': 'TimelineClearCache'},
+        {'type': 'TimelineTerminateTimeline', 'direction': 'Top'},
+        {'type': 'TimelineAddEntries', 'entries': entries},
+    ]}}}}}}
+
+
+def search_page(n: int = 20, cursor: str = 'scroll:thGAVUV0VFVBaAwL', seed: int = 0) -> dict:
+    """
+    An `adaptive.json` search page of `n` tweets by different authors, last page if `cursor` is empty.
+    """
+    rng = random.Random(seed)
+    tweets, users, entries = {}, {}, []
+    for i in range(n):
+        tweet_id = 1_650_000_000_000_000_000 + seed * 1_000 + i
+        user = user_result(rng.randrange(10 ** 9), rng)
+        tweet = tweet_result(tweet_id, user, rng)['legacy']
+        tweets[str(tweet_id)] = tweet | {'id': tweet_id, 'user_id': int(user['rest_id'])}
+        users[user['rest_id']] = user['legacy'] | {'id': int(user['rest_id']), 'id_str': user['rest_id']}
+        entries.append({'entryId': f'sq-I-t-{tweet_id}', 'sortIndex': str(tweet_id), 'content': {
+            'item': {'content': {'tweet': {'id': str(tweet_id), 'displayType': 'Tweet'}}}}})
+    if cursor:
+        entries.append({'entryId': 'cursor-bottom-0', 'sortIndex': '0', 'content': {
+            'operation': {'cursor': {'value': cursor, 'cursorType': 'Bottom'}}}})
+    return {
+        'globalObjects': {'tweets': tweets, 'users': users, 'moments': {}, 'cards': {}, 'places': {}, 'media': {},
+                          'broadcasts': {}, 'topics': {}, 'lists': {}},
+        'timeline': {'id': 'search-6', 'instructions': [{'addEntries': {'entries': entries}}]},
+    }
+
+
+def load_pages(paths: list[str]) -> list[dict]:
+    """
+    Load recorded pages from JSON files, or from every JSON file within the given directories.
+    """
+    pages = []
+    for p in map(Path, paths):
+        for f in sorted(p.rglob('*.json')) if p.is_dir() else [p]:
+            pages.append(orjson.loads(f.read_bytes()))
+    return pages
+
+
+def default_pages(n: int = 20) -> dict[str, list[dict]]:
+    # round-trip through JSON so pages share no objects, like decoded responses
+    return {
+        'UserTweets': [orjson.loads(orjson.dumps(user_tweets_page(seed=i, cursor=f'c{i}'))) for i in range(n)],
+        'Followers': [orjson.loads(orjson.dumps(followers_page(seed=i, cursor=f'c{i}'))) for i in range(n)],
+    }
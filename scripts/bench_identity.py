@@ -0,0 +1,65 @@
+"""
+Benchmark the author identity map of `normalize_resp` on single-author timelines (`UserTweets`):
+tweets normalized per second and `User` objects built, without an identity map, with one per page
+(the default), and with one shared by the whole run.
+
+usage: python bench_identity.py [--pages N] [--page-size N] [--repeat N] [recorded pages or directories ...]
+"""
+import argparse
+import time
+
+import orjson
+
+from bench_fixtures import load_pages, user_tweets_page
+from twitter_api_client.normalize import normalize_resp
+
+
+class NoIdentityMap(dict):
+    """
+    Never remembers a user, so every tweet builds its author again, as before the identity map.
+    """
+
+    def __setitem__(self, key, value):
+        ...
+
+
+def run(raw_pages: list[bytes], factory: type, shared: bool = False) -> tuple[int, int, float]:
+    pages = [orjson.loads(raw) for raw in raw_pages]
+    users = factory()
+    start = time.process_time()
+    tweets = []
+    for page in pages:
+        tweets.extend(normalize_resp(page, users if shared else factory()))
+    elapsed = time.process_time() - start
+    authors = {id(t.author) for t in tweets} | {id(t.quoted_status.author) for t in tweets if t.quoted_status}
+    return len(tweets), len(authors), elapsed
+
+
+def main(args):
+    if args.pages:
+        raw_pages = [orjson.dumps(p) for p in load_pages(args.pages)]
+    else:
+        raw_pages = [orjson.dumps(user_tweets_page(n=args.page_size, seed=i)) for i in range(args.n)]
+    variants = {
+        'no identity map': lambda: run(raw_pages, NoIdentityMap),
+        'per page': lambda: run(raw_pages, dict),
+        'per run': lambda: run(raw_pages, dict, shared=True),
+    }
+    baseline = None
+    for name, fn in variants.items():
+        best = None
+        for _ in range(args.repeat):
+            n, authors, elapsed = fn()
+            best = elapsed if best is None else min(best, elapsed)
+        baseline = baseline or best
+        print(f'{name:<16} tweets: {n:>7,}   User objects: {authors:>7,}   '
+              f'{n / best:>9,.0f} tweets/s   speedup: {baseline / best:.2f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', dest='n', type=int, default=200, help='synthetic pages')
+    parser.add_argument('--page-size', type=int, default=20, help='tweets per synthetic page')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per variant, the fastest is reported')
+    parser.add_argument('pages', nargs='*', help='recorded pages (JSON files or directories)')
+    main(parser.parse_args())
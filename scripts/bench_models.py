@@ -0,0 +1,142 @@
+"""
+Memory benchmark: bytes per normalized tweet held in memory, with the slotted models and interned
+`language`/media `type`/`verified_type` strings, vs. the previous `__dict__`-backed models.
+
+Builds `--count` tweets with `normalize_resp` from `UserTweets` pages and keeps them while the raw pages
+are dropped. Reports the growth of the resident set per tweet, the exact memory still allocated per tweet
+for a smaller `--sample` (traced with `tracemalloc`, which is too slow for the full run), and the size
+of a single instance of each model.
+
+Each variant runs in its own process, so the measurements do not interfere.
+
+usage: python bench_models.py [--count N] [--sample N] [--page-size N] [recorded pages or directories ...]
+"""
+import argparse
+import dataclasses
+import gc
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+
+import orjson
+
+from bench_fixtures import load_pages, user_tweets_page
+from twitter_api_client import models, normalize
+from twitter_api_client.normalize import normalize_resp
+
+MODELS = ['Tweet', 'User', 'Media', 'ExtendedMedia', 'TweetMetrics', 'UserMetrics', 'TombTweet']
+
+
+class LegacyBase:
+    def __getitem__(self, attr):
+        return getattr(self, attr)
+
+    def get(self, attr, default=None):
+        if not hasattr(self, attr):
+            return default
+        return self[attr]
+
+
+def legacy(cls: type) -> type:
+    """
+    The same dataclass without slots, as the models were before.
+    """
+    fields = [(f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+              for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(cls.__name__, fields, bases=(LegacyBase,))
+
+
+def use_legacy_models() -> None:
+    for name in MODELS:
+        setattr(normalize, name, legacy(getattr(models, name)))
+    normalize.intern = lambda s: s
+
+
+def instance_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def rss() -> int | None:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return None
+
+
+def build(raw_pages: list[bytes], count: int) -> list:
+    tweets = []
+    while len(tweets) < count:
+        for raw in raw_pages:
+            # decode every page, so tweets share no objects, like real responses
+            tweets.extend(normalize_resp(orjson.loads(raw)))
+            if len(tweets) >= count:
+                break
+    return tweets
+
+
+def run(variant: str, args, raw_pages: list[bytes], out: multiprocessing.Queue) -> None:
+    if variant == 'before':
+        use_legacy_models()
+
+    # exact retained bytes of a sample; tracing every allocation is too slow for the full run
+    gc.collect()
+    tracemalloc.start()
+    tweets = build(raw_pages, args.sample)
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] / len(tweets)
+    tracemalloc.stop()
+
+    sample = next(t for t in tweets if t.media)
+    sizes = {
+        'Tweet': instance_size(sample),
+        'User': instance_size(sample.author),
+        'Media': instance_size(sample.media[0]),
+        'TweetMetrics': instance_size(sample.public_metrics),
+        'UserMetrics': instance_size(sample.author.public_metrics),
+    }
+    del tweets, sample
+    gc.collect()
+
+    before = rss()
+    start = time.perf_counter()
+    tweets = build(raw_pages, args.count)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    after = rss()
+    grown = (after - before) / len(tweets) if before is not None else float('nan')
+    out.put((variant, len(tweets), traced, grown, elapsed, sizes))
+
+
+def main(args):
+    if args.pages:
+        raw_pages = [orjson.dumps(p) for p in load_pages(args.pages)]
+    else:
+        raw_pages = [orjson.dumps(user_tweets_page(n=args.page_size, seed=i)) for i in range(64)]
+    out = multiprocessing.Queue()
+    results = {}
+    for variant in ('before', 'after'):
+        p = multiprocessing.Process(target=run, args=(variant, args, raw_pages, out))
+        p.start()
+        variant, n, traced, grown, elapsed, sizes = out.get()
+        p.join()
+        results[variant] = traced
+        print(f'{variant:<7} retained: {traced:>6,.0f} bytes/tweet (traced, {args.sample:,} tweets)   '
+              f'RSS: {grown:>6,.0f} bytes/tweet ({n:,} tweets)   '
+              f'{grown * n / 1024 ** 2:>6,.0f} MiB   build: {elapsed:>5.1f} s')
+        print(' ' * 8 + '   '.join(f'{k}: {v} B' for k, v in sizes.items()))
+    print(f'saving: {1 - results["after"] / results["before"]:.1%} per tweet')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--count', type=int, default=1_000_000, help='tweets to build')
+    parser.add_argument('--sample', type=int, default=20_000, help='tweets to measure exactly with tracemalloc')
+    parser.add_argument('--page-size', type=int, default=20, help='tweets per synthetic page')
+    parser.add_argument('pages', nargs='*', help='recorded pages (JSON files or directories)')
+    main(parser.parse_args())
@@ -0,0 +1,62 @@
+"""
+Throughput benchmark of `normalize_resp`: objects (tweets or users) normalized per second, per operation.
+
+Pages are decoded from JSON before every run, as `normalize_resp` modifies them in place.
+Without recorded pages, synthetic `UserTweets` and `Followers` pages from `bench_fixtures` are used.
+With `--workers`, `normalize_many` is measured as well, in wall time, with 1 and N worker processes.
+
+usage: python bench_normalize.py [--pages N] [--repeat N] [--workers N] [recorded pages or directories ...]
+"""
+import argparse
+import time
+
+import orjson
+
+from bench_fixtures import default_pages, load_pages
+from twitter_api_client.normalize import normalize_many, normalize_resp
+
+
+def run(raw_pages: list[bytes]) -> tuple[int, float]:
+    pages = [orjson.loads(raw) for raw in raw_pages]
+    start = time.process_time()
+    n = sum(len(normalize_resp(page)) for page in pages)
+    return n, time.process_time() - start
+
+
+def run_many(raw_pages: list[bytes], workers: int, as_dicts: bool) -> tuple[int, float]:
+    start = time.perf_counter()
+    n = len(normalize_many(raw_pages, workers=workers, as_dicts=as_dicts))
+    return n, time.perf_counter() - start
+
+
+def main(args):
+    if args.pages:
+        ops = {'recorded': load_pages(args.pages)}
+    else:
+        ops = default_pages(args.n)
+    for name, pages in ops.items():
+        raw_pages = [orjson.dumps(page) for page in pages]
+        best = None
+        for _ in range(args.repeat):
+            n, elapsed = run(raw_pages)
+            best = elapsed if best is None else min(best, elapsed)
+        print(f'{name:<12} pages: {len(pages):>6,}   objects: {n:>8,}   '
+              f'{n / best:>9,.0f} objects/s   {best / len(pages) * 1e3:>6.2f} ms/page')
+        if not args.workers:
+            continue
+        for workers in sorted({1, args.workers}):
+            for as_dicts in (False, True):
+                n, elapsed = min((run_many(raw_pages, workers, as_dicts) for _ in range(args.repeat)),
+                                 key=lambda r: r[1])
+                label = f'{workers} worker{"s" * (workers > 1)}{", dicts" * as_dicts}'
+                print(f'  normalize_many ({label}){"":<{18 - len(label)}}'
+                      f'{n / elapsed:>9,.0f} objects/s   {elapsed / len(pages) * 1e3:>6.2f} ms/page')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', dest='n', type=int, default=200, help='synthetic pages per operation')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per operation, the fastest is reported')
+    parser.add_argument('--workers', type=int, help='also measure normalize_many with this many processes')
+    parser.add_argument('pages', nargs='*', help='recorded pages (JSON files or directories)')
+    main(parser.parse_args())
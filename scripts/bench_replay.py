@@ -0,0 +1,174 @@
+"""
+Offline throughput benchmark: pages/s, CPU per page and peak memory of `Scraper._paginate`,
+`Search.paginate` and `normalize_resp`, against responses replayed from an archive instead of twitter.com.
+Also compares fetching all pages and then normalizing them with the pipelined `normalize=True` mode.
+
+Record fixtures once with `RecordTransport`, e.g.
+
+    archive = Archive('fixtures')
+    scraper = Scraper(email, username, password, client_kwargs={'transport': RecordTransport(archive)})
+    scraper.followers([44196397])
+
+Without an archive, synthetic chains built from `bench_fixtures` are used.
+
+usage: python bench_replay.py [--latency SECONDS] [--rate-limit N] [--queries N] [--pages N] [fixture archive]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import orjson
+from httpx import Client
+
+from bench_fixtures import followers_page, search_page, user_tweets_page
+from twitter_api_client.archive import Archive
+from twitter_api_client.constants import Operation, search_config
+from twitter_api_client.normalize import normalize_resp
+from twitter_api_client.replay import ReplayTransport
+from twitter_api_client.scraper import Scraper
+from twitter_api_client.search import Search
+
+# operations `normalize_resp` understands
+TIMELINES = {'UserTweets', 'UserTweetsAndReplies', 'UserMedia', 'Likes', 'Followers', 'Following', 'TweetDetail'}
+SESSION = {'ct0': 'bench', 'auth_token': 'bench'}
+
+
+def build_archive(path: Path, queries: int, pages: int) -> Archive:
+    """
+    Write `queries` chains of `pages` pages each for `UserTweets`, `Followers` and search.
+    """
+    archive = Archive(path)
+    for q in range(queries):
+        for p in range(pages):
+            cursor = f'{q}-{p}' if p else None
+            nxt = f'{q}-{p + 1}' if p + 1 < pages else None
+            seed = q * pages + p
+            archive.write('UserTweets', {'userId': q}, cursor, orjson.dumps(user_tweets_page(cursor=nxt, seed=seed)))
+            archive.write('Followers', {'userId': q}, cursor, orjson.dumps(followers_page(cursor=nxt, seed=seed)))
+            nxt = nxt and f'scroll:{nxt}'
+            archive.write('adaptive', {'q': f'bench {q}'}, cursor and f'scroll:{cursor}',
+                          orjson.dumps(search_page(cursor=nxt, seed=seed)))
+    archive.close()
+    return archive
+
+
+def first_pages(archive: Archive, name: str) -> list[dict]:
+    return [e['query'] for e in archive.index(name) if e['cursor'] is None]
+
+
+def measure(fn) -> tuple[float, float, int]:
+    """
+    Wall and CPU seconds of one run, then peak traced memory of a second run (tracing skews timings).
+    """
+    wall, cpu = time.perf_counter(), time.process_time()
+    fn()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return wall, cpu, peak
+
+
+def report(name: str, pages: int, wall: float, cpu: float, peak: int) -> None:
+    print(f'{name:<24} pages: {pages:<6} '
+          f'{pages / wall:>9.1f} pages/s   '
+          f'cpu: {cpu / pages * 1e3:>7.3f} ms/page   '
+          f'peak: {peak / 1024 ** 2:>8.1f} MiB')
+
+
+def bench_scraper(archive: Archive, transport: ReplayTransport) -> None:
+    for name in archive.operations():
+        if not (queries := first_pages(archive, name)) or not isinstance(getattr(Operation, name, None), tuple):
+            continue
+        operation = getattr(Operation, name)
+
+        def run():
+            scraper = Scraper(session=Client(cookies=SESSION), save=False, pbar=False,
+                              client_kwargs={'transport': transport})
+            scraper._run_sync(scraper._arun(operation, queries))
+            scraper.close()
+
+        before = transport.requests
+        wall, cpu, peak = measure(run)
+        report(f'Scraper._paginate {name}', (transport.requests - before) // 2, wall, cpu, peak)
+
+
+def bench_pipeline(archive: Archive, transport: ReplayTransport) -> None:
+    for name in archive.operations():
+        if name not in TIMELINES or not (queries := first_pages(archive, name)):
+            continue
+        operation = getattr(Operation, name)
+
+        def run(normalize: bool) -> int:
+            scraper = Scraper(session=Client(cookies=SESSION), save=False, pbar=False,
+                              client_kwargs={'transport': transport})
+            if normalize:
+                objs = scraper._run_sync(scraper._arun(operation, queries, normalize=True))
+            else:
+                pages = scraper._run_sync(scraper._arun(operation, queries))
+                objs = [obj for page in pages for obj in normalize_resp(page)]
+            scraper.close()
+            return len(objs)
+
+        for normalize in (False, True):
+            before = transport.requests
+            wall, cpu, peak = measure(lambda: run(normalize))
+            mode = 'pipelined' if normalize else 'sequential'
+            report(f'{name} {mode}', (transport.requests - before) // 2, wall, cpu, peak)
+
+
+def bench_search(archive: Archive, transport: ReplayTransport) -> None:
+    if not (queries := first_pages(archive, 'adaptive')):
+        return
+
+    def run():
+        search = Search(session=Client(cookies=SESSION), save=False, client_kwargs={'transport': transport})
+
+        async def paginate():
+            # one query at a time, concurrent queries share `config`
+            for q in queries:
+                await search.paginate(q['q'], search.client, dict(search_config) | q, Path('.'))
+            await search.aclose()
+
+        asyncio.run(paginate())
+
+    before = transport.requests
+    wall, cpu, peak = measure(run)
+    report('Search.paginate', (transport.requests - before) // 2, wall, cpu, peak)
+
+
+def bench_normalize(archive: Archive) -> None:
+    pages = [page for name in archive.operations() if name in TIMELINES for page in archive.read(name)]
+    if not pages:
+        return
+    wall, cpu, peak = measure(lambda: [normalize_resp(page) for page in pages])
+    report('normalize_resp', len(pages), wall, cpu, peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('archive', nargs='?', help='fixture archive recorded with RecordTransport')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds per response')
+    parser.add_argument('--rate-limit', type=int, default=None, help='simulated requests per 15 minute window')
+    parser.add_argument('--queries', type=int, default=20, help='synthetic chains per operation')
+    parser.add_argument('--pages', type=int, default=10, help='synthetic pages per chain')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.archive:
+            archive = Archive(args.archive)
+        else:
+            archive = build_archive(Path(tmp), args.queries, args.pages)
+        transport = ReplayTransport(archive, latency=args.latency, rate_limit=args.rate_limit)
+        bench_scraper(archive, transport)
+        bench_pipeline(archive, transport)
+        bench_search(archive, transport)
+        bench_normalize(archive)
+
+
+if __name__ == '__main__':
+    main()
@@ -381,6 +381,11 @@ setup(
     author_email="trevorhobenshield@gmail.com",
     url="https://github.com/trevorhobenshield/twitter-api-client",
     install_requires=install_requires,
+    extras_require={
+        "zstd": ["zstandard"],
+        "http2": ["h2"],
+        "arrow": ["pyarrow"],
+    },
     keywords="twitter api client async search automation bot scrape",
     packages=find_packages(),
     include_package_data=True,
@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+
+from twitter_api_client.account import AsyncAccount
+from twitter_api_client.bulk import ActionLimiter
+from twitter_api_client.ratelimit import RateLimiter
+from twitter_api_client.retry import RetryPolicy
+
+
+def account(responses: list[httpx.Response], limiter: ActionLimiter) -> tuple[AsyncAccount, list]:
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return responses[min(len(sent), len(responses)) - 1]
+
+    session = httpx.Client(cookies={'ct0': 'ct0', 'auth_token': 'auth_token'})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncAccount(session=session, client=client, save=False, action_limiter=limiter,
+                        retry=RetryPolicy(retries=2, backoff=0),
+                        rate_limiter=RateLimiter(margin=0, backoff=0)), sent
+
+
+def like(responses: list[httpx.Response], limiter: ActionLimiter):
+    acct, sent = account(responses, limiter)
+    res = asyncio.run(acct.run_many('like', [1], pbar=False))
+    return res[1], sent
+
+
+def test_transient_error_code_is_retried():
+    limiter = ActionLimiter()
+    outcome, sent = like([
+        httpx.Response(503, json={'errors': [{'code': 131, 'message': 'Internal error'}]}),
+        httpx.Response(200, json={'data': {'favorite_tweet': 'Done'}}),
+    ], limiter)
+    assert outcome.ok
+    assert len(sent) == 2
+    # charged once, however many attempts
+    assert len(limiter.history['like']) == 1
+
+
+def test_client_error_is_not_retried():
+    limiter = ActionLimiter()
+    outcome, sent = like([httpx.Response(403, json={'errors': [{'code': 144, 'message': 'No status'}]})], limiter)
+    assert not outcome.ok
+    assert len(sent) == 1
+    assert len(limiter.history['like']) == 1
+
+
+def test_rate_limited_action_gives_its_slot_back():
+    limiter = ActionLimiter()
+    outcome, sent = like([httpx.Response(429, text='Rate limit exceeded')], limiter)
+    assert not outcome.ok
+    assert len(sent) == 3
+    assert not limiter.history['like']
+
+
+def test_already_done_counts_as_success():
+    outcome, _ = like([httpx.Response(403, json={'errors': [{'code': 139, 'message': 'Already favorited'}]})],
+                      ActionLimiter())
+    assert outcome.ok
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+sys.path.insert(0, str(Path(__file__).parents[1] / 'scripts'))
+from bench_fixtures import user_tweets_page  # noqa: E402
+from twitter_api_client.export import to_arrow, to_parquet  # noqa: E402
+
+
+def pages() -> list[dict]:
+    # the same page twice, so every row has a duplicate
+    return [user_tweets_page(seed=0), user_tweets_page(seed=0)]
+
+
+def test_dedup():
+    tables = to_arrow(pages())
+    for name in ('tweets', 'users', 'media'):
+        ids = tables[name].column('id').to_pylist()
+        assert ids and len(ids) == len(set(ids))
+
+
+def test_without_dedup_keeps_duplicates(tmp_path):
+    deduped = to_arrow(pages())
+    tables = to_arrow(pages(), dedup=False)
+    assert tables['tweets'].num_rows == 2 * deduped['tweets'].num_rows
+    paths = to_parquet(pages(), tmp_path, dedup=False)
+    assert set(paths) == {'tweets', 'users', 'media'}
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+from httpx import Request, Response
+
+from twitter_api_client.ratelimit import RateLimiter
+
+
+def response(status: int, **headers) -> Response:
+    return Response(status, headers={k.replace('_', '-'): str(v) for k, v in headers.items()},
+                    request=Request('GET', 'https://twitter.com/i/api/graphql/x/UserTweets'))
+
+
+def metered(remaining: int = 10) -> Response:
+    return response(200, x_rate_limit_limit=50, x_rate_limit_remaining=remaining,
+                    x_rate_limit_reset=int(time.time()) + 900)
+
+
+def test_learns_budget_from_headers():
+    limiter = RateLimiter()
+    asyncio.run(limiter.acquire('UserTweets'))
+    limiter.update('UserTweets', metered(10))
+    assert limiter.capacity('UserTweets') == 10
+
+
+def test_success_without_headers_is_unmetered():
+    limiter = RateLimiter()
+    asyncio.run(limiter.acquire('UserTweets'))
+    limiter.update('UserTweets', response(200))
+    assert limiter.windows['UserTweets'].unmetered
+    assert limiter.capacity('UserTweets') is None
+
+
+def test_error_without_headers_keeps_pacing():
+    limiter = RateLimiter()
+    asyncio.run(limiter.acquire('UserTweets'))
+    limiter.update('UserTweets', metered(3))
+    for status in (404, 500, 503):
+        limiter.update('UserTweets', response(status))
+        assert not limiter.windows['UserTweets'].unmetered
+    assert limiter.capacity('UserTweets') == 3
+
+
+def test_headers_meter_an_unmetered_window_again():
+    limiter = RateLimiter()
+    limiter.update('UserTweets', response(200))
+    limiter.update('UserTweets', metered(5))
+    assert not limiter.windows['UserTweets'].unmetered
+    assert limiter.capacity('UserTweets') == 5
+
+
+def test_429_exhausts_window():
+    limiter = RateLimiter(backoff=60)
+    asyncio.run(limiter.acquire('UserTweets'))
+    limiter.update('UserTweets', metered(5))
+    limiter.update('UserTweets', response(429))
+    assert limiter.capacity('UserTweets') == 0
+    assert limiter.windows['UserTweets'].reset >= time.time() + 59
+    assert not limiter.windows['UserTweets'].unmetered
+
+
+def test_429_waits_for_reset():
+    limiter = RateLimiter(margin=0)
+    limiter.update('UserTweets', response(429, x_rate_limit_remaining=0, x_rate_limit_reset=time.time() + 0.3))
+
+    async def acquire() -> float:
+        start = time.perf_counter()
+        await limiter.acquire('UserTweets')
+        return time.perf_counter() - start
+
+    assert asyncio.run(acquire()) >= 0.25
+
+
+def test_429_with_reset_only_waits_for_reset():
+    limiter = RateLimiter(backoff=60)
+    reset = int(time.time()) + 600
+    limiter.update('UserTweets', response(429, x_rate_limit_reset=reset))
+    assert limiter.windows['UserTweets'].reset == reset
+    assert limiter.capacity('UserTweets') == 0
+
+
+def test_429_with_past_reset_backs_off():
+    limiter = RateLimiter(backoff=60)
+    limiter.update('UserTweets', response(429, x_rate_limit_reset=int(time.time()) - 5))
+    assert limiter.windows['UserTweets'].reset >= time.time() + 59
+
+
+def test_429_meters_an_unmetered_window():
+    limiter = RateLimiter()
+    limiter.update('UserTweets', response(200))
+    limiter.update('UserTweets', response(429))
+    assert not limiter.windows['UserTweets'].unmetered
+
+
+def test_plentiful_budget_is_not_paced():
+    limiter = RateLimiter()
+    limiter.update('UserTweets', metered(100))
+
+    async def crawl() -> float:
+        start = time.perf_counter()
+        for _ in range(4):
+            await limiter.acquire('UserTweets')
+            limiter.update('UserTweets', metered(limiter.windows['UserTweets'].remaining - 1))
+        return time.perf_counter() - start
+
+    assert asyncio.run(crawl()) < 0.5
+
+
+def test_nearly_exhausted_budget_is_paced():
+    limiter = RateLimiter(reserve=0.2)
+    limiter.update('UserTweets', response(200, x_rate_limit_limit=50, x_rate_limit_remaining=5,
+                                          x_rate_limit_reset=time.time() + 2))
+
+    async def burst() -> float:
+        start = time.perf_counter()
+        await asyncio.gather(*(limiter.acquire('UserTweets') for _ in range(3)))
+        return time.perf_counter() - start
+
+    # 5 left over 2 seconds: the first request goes at once, the next two wait for evenly spaced slots
+    assert 0.5 < asyncio.run(burst()) < 2
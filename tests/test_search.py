@@ -0,0 +1,32 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from twitter_api_client.constants import search_config
+from twitter_api_client.search import Search
+
+
+def test_failing_slice_does_not_stop_shard(tmp_path, caplog):
+    search = Search(session=httpx.Client(cookies={'ct0': 'ct0', 'auth_token': 'auth_token'}), save=False)
+    searched = []
+
+    async def pages(query, session, config, out, **kwargs):
+        searched.append(query)
+        if len(searched) <= 2:
+            raise httpx.ConnectError('connection refused')
+        yield {'globalObjects': {'tweets': {query: {}}}}
+
+    search._pages = pages
+
+    async def run():
+        try:
+            return await asyncio.wait_for(search.shard('python', dict(search_config), Path(tmp_path), shards=4,
+                                                       since='2023-01-01', until='2023-01-05'), 5)
+        finally:
+            await search.aclose()
+
+    results = asyncio.run(run())
+    assert len(searched) == 4
+    assert len(results) == 2
+    assert sum('ConnectError' in r.message for r in caplog.records) == 2
@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import logging
 import math
@@ -7,12 +8,20 @@ import random
 from copy import deepcopy
 from datetime import datetime
 from string import ascii_letters
+from typing import AsyncGenerator
 from uuid import uuid1, getnode
 
+import aiofiles
+from httpx import AsyncClient
 from tqdm import tqdm
 
+from .bulk import ALREADY_DONE, RATE_LIMITED, TRANSIENT, ActionLimiter, Outcome
+from .checkpoint import Checkpoints
+from .connection import ConnectionProfile
 from .constants import *
 from .login import login
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
 from .util import *
 
 logger = logging.getLogger(__name__)
@@ -40,6 +49,9 @@ class Account:
         self.session = self._validate_session(email, username, password, session, **kwargs)
         self.save = kwargs.get('save', True)
         self.debug = kwargs.get('debug', 0)
+        self.action_limiter = kwargs.get('action_limiter') or ActionLimiter()
+        checkpoints = kwargs.get('checkpoints')
+        self.checkpoints = Checkpoints() if checkpoints is True else checkpoints
         self.gql_api = 'https://twitter.com/i/api/graphql'
         self.v1_api = 'https://api.twitter.com/1.1'
 
@@ -106,75 +118,17 @@ class Account:
         return res
 
     def tweet(self, text: str, *, media: any = None, **kwargs) -> dict:
-        variables = {
-            'tweet_text': text,
-            'dark_request': False,
-            'media': {
-                'media_entities': [],
-                'possibly_sensitive': False,
-            },
-            'semantic_annotation_ids': [],
-        }
-        if media:
-            for m in media:
-                media_id = self._upload_media(m['media'])
-                variables['media']['media_entities'].append({
-                    'media_id': media_id,
-                    'tagged_users': m.get('tagged_users', [])
-                })
-                if alt := m.get('alt'):
-                    self._add_alt_text(media_id, alt)
-        if reply_params := kwargs.get('reply_params', {}):
-            variables |= reply_params
-        if quote_params := kwargs.get('quote_params', {}):
-            variables |= quote_params
-        if poll_params := kwargs.get('poll_params', {}):
-            variables |= poll_params
-        return self.gql('POST', Operation.CreateTweet, variables)
+        entities = [{'media_id': self._upload_with_alt(m), 'tagged_users': m.get('tagged_users', [])}
+                    for m in media or []]
+        return self.gql('POST', Operation.CreateTweet, self._tweet_variables(text, entities, **kwargs))
 
     def schedule_tweet(self, text: str, date: int | str, *, media: list = None) -> dict:
-        variables = {
-            'post_tweet_request': {
-                'auto_populate_reply_metadata': False,
-                'status': text,
-                'exclude_reply_user_ids': [],
-                'media_ids': [],
-            },
-            'execute_at': (
-                datetime.strptime(date, "%Y-%m-%d %H:%M").timestamp()
-                if isinstance(date, str)
-                else date
-            ),
-        }
-        if media:
-            for m in media:
-                media_id = self._upload_media(m['media'])
-                variables['post_tweet_request']['media_ids'].append(media_id)
-                if alt := m.get('alt'):
-                    self._add_alt_text(media_id, alt)
-        return self.gql('POST', Operation.CreateScheduledTweet, variables)
+        media_ids = [self._upload_with_alt(m) for m in media or []]
+        return self.gql('POST', Operation.CreateScheduledTweet, self._scheduled_variables(text, date, media_ids))
 
     def schedule_reply(self, text: str, date: int | str, tweet_id: int, *, media: list = None) -> dict:
-        variables = {
-            'post_tweet_request': {
-                'auto_populate_reply_metadata': True,
-                'in_reply_to_status_id': tweet_id,
-                'status': text,
-                'exclude_reply_user_ids': [],
-                'media_ids': [],
-            },
-            'execute_at': (
-                datetime.strptime(date, "%Y-%m-%d %H:%M").timestamp()
-                if isinstance(date, str)
-                else date
-            ),
-        }
-        if media:
-            for m in media:
-                media_id = self._upload_media(m['media'])
-                variables['post_tweet_request']['media_ids'].append(media_id)
-                if alt := m.get('alt'):
-                    self._add_alt_text(media_id, alt)
+        media_ids = [self._upload_with_alt(m) for m in media or []]
+        variables = self._scheduled_variables(text, date, media_ids, tweet_id)
         return self.gql('POST', Operation.CreateScheduledTweet, variables)
 
     def unschedule_tweet(self, tweet_id: int) -> dict:
@@ -409,6 +363,68 @@ class Account:
         )
         return r
 
+    def like_many(self, tweet_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        """
+        Like many tweets. See `AsyncAccount.run_many` for the keyword arguments.
+
+        @param tweet_ids: list of tweet ids
+        @return: outcome of each tweet id
+        """
+        return self._many('like', tweet_ids, **kwargs)
+
+    def unlike_many(self, tweet_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('unlike', tweet_ids, **kwargs)
+
+    def retweet_many(self, tweet_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('retweet', tweet_ids, **kwargs)
+
+    def unretweet_many(self, tweet_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('unretweet', tweet_ids, **kwargs)
+
+    def bookmark_many(self, tweet_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('bookmark', tweet_ids, **kwargs)
+
+    def unbookmark_many(self, tweet_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('unbookmark', tweet_ids, **kwargs)
+
+    def follow_many(self, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        """
+        Follow many users. See `AsyncAccount.run_many` for the keyword arguments.
+
+        @param user_ids: list of user ids
+        @return: outcome of each user id
+        """
+        return self._many('follow', user_ids, **kwargs)
+
+    def unfollow_many(self, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('unfollow', user_ids, **kwargs)
+
+    def mute_many(self, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('mute', user_ids, **kwargs)
+
+    def unmute_many(self, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('unmute', user_ids, **kwargs)
+
+    def block_many(self, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('block', user_ids, **kwargs)
+
+    def unblock_many(self, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('unblock', user_ids, **kwargs)
+
+    def add_list_members(self, list_id: int, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('add_list_member', user_ids, list_id, **kwargs)
+
+    def remove_list_members(self, list_id: int, user_ids: list[int], **kwargs) -> dict[int, Outcome]:
+        return self._many('remove_list_member', user_ids, list_id, **kwargs)
+
+    def _many(self, action: str, ids: list, *args, **kwargs) -> dict:
+        async def run():
+            async with AsyncAccount(session=self.session, debug=self.debug, action_limiter=self.action_limiter,
+                                    checkpoints=self.checkpoints) as account:
+                return await account.run_many(action, ids, *args, **kwargs)
+
+        return asyncio.run(run())
+
     def home_timeline(self, limit=math.inf) -> list[dict]:
         return self._paginate('POST', Operation.HomeTimeline, Operation.default_variables, limit)
 
@@ -451,16 +467,6 @@ class Account:
         https://developer.twitter.com/en/docs/twitter-api/v1/media/upload-media/uploading-media/media-best-practices
         """
 
-        def check_media(category: str, size: int) -> None:
-            fmt = lambda x: f'{(x / 1e6):.2f} MB'
-            msg = lambda x: f'cannot upload {fmt(size)} {category}, max size is {fmt(x)}'
-            if category == 'image' and size > MAX_IMAGE_SIZE:
-                raise Exception(msg(MAX_IMAGE_SIZE))
-            if category == 'gif' and size > MAX_GIF_SIZE:
-                raise Exception(msg(MAX_GIF_SIZE))
-            if category == 'video' and size > MAX_VIDEO_SIZE:
-                raise Exception(msg(MAX_VIDEO_SIZE))
-
         # if is_profile:
         #     url = 'https://upload.twitter.com/i/media/upload.json'
         # else:
@@ -469,17 +475,8 @@ class Account:
         url = 'https://upload.twitter.com/i/media/upload.json'
 
         file = Path(filename)
-        total_bytes = file.stat().st_size
         headers = get_headers(self.session)
-
-        upload_type = 'dm' if is_dm else 'tweet'
-        media_type = mimetypes.guess_type(file)[0]
-        media_category = f'{upload_type}_gif' if 'gif' in media_type else f'{upload_type}_{media_type.split("/")[0]}'
-
-        check_media(media_category, total_bytes)
-
-        params = {'command': 'INIT', 'media_type': media_type, 'total_bytes': total_bytes,
-                  'media_category': media_category}
+        params = self._upload_params(file, is_dm)
         r = self.session.post(url=url, headers=headers, params=params)
 
         if r.status_code >= 400:
@@ -488,25 +485,13 @@ class Account:
         media_id = r.json()['media_id']
 
         desc = f"uploading: {file.name}"
-        with tqdm(total=total_bytes, desc=desc, unit='B', unit_scale=True, unit_divisor=1024) as pbar:
+        with tqdm(total=params['total_bytes'], desc=desc, unit='B', unit_scale=True, unit_divisor=1024) as pbar:
             with open(file, 'rb') as fp:
                 i = 0
                 while chunk := fp.read(UPLOAD_CHUNK_SIZE):
                     params = {'command': 'APPEND', 'media_id': media_id, 'segment_index': i}
                     try:
-                        pad = bytes(''.join(random.choices(ascii_letters, k=16)), encoding='utf-8')
-                        data = b''.join([
-                            b'------WebKitFormBoundary',
-                            pad,
-                            b'\r\nContent-Disposition: form-data; name="media"; filename="blob"',
-                            b'\r\nContent-Type: application/octet-stream',
-                            b'\r\n\r\n',
-                            chunk,
-                            b'\r\n------WebKitFormBoundary',
-                            pad,
-                            b'--\r\n',
-                        ])
-                        _headers = {b'content-type': b'multipart/form-data; boundary=----WebKitFormBoundary' + pad}
+                        _headers, data = self._multipart(chunk)
                         r = self.session.post(url=url, headers=headers | _headers, params=params, content=data)
                     except Exception as e:
                         logger.error(f'Failed to upload chunk, trying alternative method: {e}')
@@ -551,12 +536,98 @@ class Account:
         # logger.debug('processing complete')
         return media_id
 
+    @staticmethod
+    def _upload_params(file: Path, is_dm: bool) -> dict:
+        """
+        Validate a file and get the params of its INIT upload command
+        """
+
+        def check_media(category: str, size: int) -> None:
+            fmt = lambda x: f'{(x / 1e6):.2f} MB'
+            msg = lambda x: f'cannot upload {fmt(size)} {category}, max size is {fmt(x)}'
+            if category == 'image' and size > MAX_IMAGE_SIZE:
+                raise Exception(msg(MAX_IMAGE_SIZE))
+            if category == 'gif' and size > MAX_GIF_SIZE:
+                raise Exception(msg(MAX_GIF_SIZE))
+            if category == 'video' and size > MAX_VIDEO_SIZE:
+                raise Exception(msg(MAX_VIDEO_SIZE))
+
+        total_bytes = file.stat().st_size
+        upload_type = 'dm' if is_dm else 'tweet'
+        media_type = mimetypes.guess_type(file)[0]
+        media_category = f'{upload_type}_gif' if 'gif' in media_type else f'{upload_type}_{media_type.split("/")[0]}'
+
+        check_media(media_category, total_bytes)
+
+        return {'command': 'INIT', 'media_type': media_type, 'total_bytes': total_bytes,
+                'media_category': media_category}
+
+    @staticmethod
+    def _multipart(chunk: bytes) -> tuple[dict, bytes]:
+        pad = bytes(''.join(random.choices(ascii_letters, k=16)), encoding='utf-8')
+        data = b''.join([
+            b'------WebKitFormBoundary',
+            pad,
+            b'\r\nContent-Disposition: form-data; name="media"; filename="blob"',
+            b'\r\nContent-Type: application/octet-stream',
+            b'\r\n\r\n',
+            chunk,
+            b'\r\n------WebKitFormBoundary',
+            pad,
+            b'--\r\n',
+        ])
+        return {b'content-type': b'multipart/form-data; boundary=----WebKitFormBoundary' + pad}, data
+
     def _add_alt_text(self, media_id: int, text: str) -> Response:
         params = {"media_id": media_id, "alt_text": {"text": text}}
         url = f'{self.v1_api}/media/metadata/create.json'
         r = self.session.post(url, headers=get_headers(self.session), json=params)
         return r
 
+    def _upload_with_alt(self, media: dict) -> int:
+        media_id = self._upload_media(media['media'])
+        if alt := media.get('alt'):
+            self._add_alt_text(media_id, alt)
+        return media_id
+
+    @staticmethod
+    def _tweet_variables(text: str, entities: list[dict], **kwargs) -> dict:
+        variables = {
+            'tweet_text': text,
+            'dark_request': False,
+            'media': {
+                'media_entities': entities,
+                'possibly_sensitive': False,
+            },
+            'semantic_annotation_ids': [],
+        }
+        if reply_params := kwargs.get('reply_params', {}):
+            variables |= reply_params
+        if quote_params := kwargs.get('quote_params', {}):
+            variables |= quote_params
+        if poll_params := kwargs.get('poll_params', {}):
+            variables |= poll_params
+        return variables
+
+    @staticmethod
+    def _scheduled_variables(text: str, date: int | str, media_ids: list[int], tweet_id: int = None) -> dict:
+        variables = {
+            'post_tweet_request': {
+                'auto_populate_reply_metadata': tweet_id is not None,
+                'status': text,
+                'exclude_reply_user_ids': [],
+                'media_ids': media_ids,
+            },
+            'execute_at': (
+                datetime.strptime(date, "%Y-%m-%d %H:%M").timestamp()
+                if isinstance(date, str)
+                else date
+            ),
+        }
+        if tweet_id is not None:
+            variables['post_tweet_request']['in_reply_to_status_id'] = tweet_id
+        return variables
+
     @staticmethod
     def _validate_session(*args, **kwargs):
         email, username, password, session = args
@@ -568,3 +639,424 @@ class Account:
             return login(email, username, password, **kwargs)
         raise Exception('Session not authenticated. '
                         'Please use an authenticated session or remove the `session` argument and try again.')
+
+
+class AsyncAccount(Account):
+    """
+    Asynchronous `Account`: every action is a coroutine, so many actions can run at once.
+
+    All requests go through a single pooled `AsyncClient`, which may be shared with other accounts or scrapers
+    via `client=...`. Cookies are kept per account, in the session's jar, and sent with each request as part of
+    the auth headers, so the client's own cookie jar is never used and accounts sharing a client stay separate.
+    Auth headers are built once and rebuilt only when a response sets new cookies (e.g. a rotated `ct0`).
+
+    The client is bound to the event loop it first runs on. Use `async with AsyncAccount(...)` or call `aclose()`
+    when done, unless the client was passed in.
+    """
+
+    def __init__(self, email: str = None, username: str = None, password: str = None, session: Client = None,
+                 client: AsyncClient = None, client_kwargs: dict = {}, **kwargs):
+        super().__init__(email, username, password, session, **kwargs)
+        self.connection = kwargs.get('connection') or ConnectionProfile()
+        self._owns_client = client is None
+        self.client = client or AsyncClient(**self.connection.client_kwargs() | client_kwargs)
+        self.cookies = self.session.cookies
+        self.rate_limiter = kwargs.get('rate_limiter') or RateLimiter()
+        self.retry = kwargs.get('retry') or RetryPolicy()
+        self._cookies_version = 0
+        self._headers_version = None
+        self._headers = {}
+        self._form_headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+    @property
+    def headers(self) -> dict:
+        """
+        Auth headers for the account's current cookies
+        """
+        self._refresh_headers()
+        return self._headers
+
+    @property
+    def form_headers(self) -> dict:
+        self._refresh_headers()
+        return self._form_headers
+
+    def _refresh_headers(self) -> None:
+        if self._headers_version != self._cookies_version:
+            self._headers_version = self._cookies_version
+            self._headers = get_headers_from_cookies({c.name: c.value for c in self.cookies.jar})
+            self._form_headers = self._headers | {'content-type': 'application/x-www-form-urlencoded'}
+
+    async def _send(self, method: str, url: str, **kwargs) -> Response:
+        """
+        Send a request with the shared client, keeping any cookies it sets in this account's jar.
+
+        The explicit `cookie` header of `self.headers` takes precedence over the client's jar.
+        """
+        r = await self.client.request(method, url, **kwargs)
+        if 'set-cookie' in r.headers:
+            self.cookies.extract_cookies(r)
+            self._cookies_version += 1
+        return r
+
+    async def gql(self, method: str, operation: tuple, variables: dict,
+                  features: dict = Operation.default_features) -> dict:
+        qid, op = operation
+        params = {
+            'queryId': qid,
+            'features': features,
+            'variables': Operation.default_variables | variables
+        }
+        if method == 'POST':
+            data = {'json': params}
+        else:
+            data = {'params': {k: orjson.dumps(v).decode() for k, v in params.items()}}
+        r = await self._request(op, method, f'{self.gql_api}/{qid}/{op}', headers=self.headers, **data)
+        return self._json(r)
+
+    async def v1(self, path: str, params: dict) -> dict:
+        r = await self._request(path, 'POST', f'{self.v1_api}/{path}', headers=self.form_headers,
+                                content=urlencode(params))
+        return self._json(r)
+
+    async def run_many(self, action: str, ids: list, *args, pbar: bool = True, **kwargs) -> dict:
+        """
+        Apply an action (`follow`, `like`, `add_list_member`, ...) to many IDs concurrently.
+
+        IDs already applied by a previous run with the same `checkpoints` are skipped, so a failed or
+        interrupted run can be resumed by calling it again.
+
+        @param action: name of the single-ID method to call
+        @param ids: list of tweet or user ids
+        @param args: arguments passed before each ID, e.g. the list id of `add_list_member`
+        @param pbar: show a progress bar
+        @param kwargs: `concurrency` and `wait`, see `iter_many`
+        @return: outcome of each ID
+        """
+        res = {}
+        with tqdm(total=len(ids), desc=action, disable=not pbar) as bar:
+            async for outcome in self.iter_many(action, ids, *args, **kwargs):
+                res[outcome.id] = outcome
+                bar.update()
+        if failed := sum(not o.ok for o in res.values()):
+            logger.warning(f'{action}: {failed}/{len(res)} failed')
+        return {i: res[i] for i in ids}
+
+    async def iter_many(self, action: str, ids: list, *args, concurrency: int = 4,
+                        wait: bool = False) -> AsyncGenerator[Outcome, None]:
+        """
+        Apply an action to many IDs, yielding the outcome of each as it completes.
+
+        Requests are paced by the `x-rate-limit-*` headers of each endpoint, and actions by `self.action_limiter`.
+        Transport errors, server errors and rate limits are retried according to `self.retry`.
+
+        @param concurrency: max actions in flight
+        @param wait: wait for the action limit to reset instead of failing the remaining IDs
+        """
+        fn = getattr(self, action)
+        query = {'action': action, 'args': list(args)}
+        done = set()
+        if self.checkpoints:
+            _, _, done = await asyncio.to_thread(self.checkpoints.load, action, query)
+        sem = asyncio.Semaphore(concurrency)
+        limited = False
+
+        async def apply(_id) -> Outcome:
+            nonlocal limited
+            if str(_id) in done:
+                return Outcome(_id, True, resumed=True)
+            async with sem:
+                # one slot per ID, however many attempts it takes
+                if limited or not await self.action_limiter.acquire(action, wait):
+                    limited = True
+                    return Outcome(_id, False, error='action limit reached')
+                budget = self.retry.new_budget()
+                attempt = 0
+                while True:
+                    try:
+                        res = await fn(*args, _id)
+                    except Exception as e:
+                        res, error, reason = None, f'{type(e).__name__}: {e}', type(e).__name__
+                    else:
+                        errors = res.get('errors') or []
+                        codes = {e.get('code') for e in errors}
+                        status = res.get('status')
+                        if not errors or codes & ALREADY_DONE:
+                            if self.checkpoints:
+                                await asyncio.to_thread(self.checkpoints.save, action, query, None, {str(_id)}, False)
+                            return Outcome(_id, True, res)
+                        error = '; '.join(str(e.get('message')) for e in errors)
+                        if status == 429 or codes & RATE_LIMITED:
+                            reason = '429'
+                        elif status in self.retry.statuses or codes & TRANSIENT:
+                            reason = 'server error'
+                        else:
+                            return Outcome(_id, False, res, error)
+                    if not budget.allow(action, reason, attempt):
+                        if res is None or reason == '429':
+                            # the action was never applied, its slot is free for another ID
+                            self.action_limiter.release(action)
+                        return Outcome(_id, False, res, error)
+                    if reason != '429':
+                        # rate limits are waited out by `self.rate_limiter` on the next request
+                        await asyncio.sleep(self.retry.delay(attempt))
+                    attempt += 1
+
+        tasks = [asyncio.create_task(apply(i)) for i in dict.fromkeys(ids)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _request(self, name: str, method: str, url: str, **kwargs) -> Response:
+        await self.rate_limiter.acquire(name)
+        try:
+            r = await self._send(method, url, **kwargs)
+        except Exception:
+            self.rate_limiter.release(name)
+            raise
+        self.rate_limiter.update(name, r)
+        if self.debug:
+            logger.debug(r)
+        return r
+
+    @staticmethod
+    def _json(r: Response) -> dict:
+        """
+        Decode a response. Error responses always carry `errors` and their HTTP `status`,
+        as twitter's error codes alone do not tell rate limits and server errors apart.
+        """
+        try:
+            data = orjson.loads(r.content)
+        except orjson.JSONDecodeError:
+            # e.g. the plain text body of a 429
+            data = {}
+        if r.is_error:
+            data = data if isinstance(data, dict) else {}
+            data.setdefault('errors', [{'message': r.text}])
+            data['status'] = r.status_code
+        return data
+
+    async def create_poll(self, text: str, choices: list[str], poll_duration: int) -> dict:
+        options = {
+            "twitter:card": "poll4choice_text_only",
+            "twitter:api:api:endpoint": "1",
+            "twitter:long:duration_minutes": poll_duration  # max: 10080
+        }
+        for i, c in enumerate(choices):
+            options[f"twitter:string:choice{i + 1}_label"] = c
+
+        url = 'https://caps.twitter.com/v2/cards/create.json'
+        r = await self._send('POST', url, headers=self.form_headers, params={'card_data': orjson.dumps(options).decode()})
+        card_uri = r.json()['card_uri']
+        return await self.tweet(text, poll_params={'card_uri': card_uri})
+
+    async def dm(self, text: str, receivers: list[int], media: str = '') -> dict:
+        variables = {
+            "message": {},
+            "requestId": str(uuid1(getnode())),
+            "target": {"participant_ids": receivers},
+        }
+        if media:
+            media_id = await self._upload_media(media, is_dm=True)
+            variables['message']['media'] = {'id': media_id, 'text': text}
+        else:
+            variables['message']['text'] = {'text': text}
+        res = await self.gql('POST', Operation.useSendMessageMutation, variables)
+        if find_key(res, 'dm_validation_failure_type'):
+            logger.debug(f"Failed to send DM(s) to {receivers}")
+        return res
+
+    async def tweet(self, text: str, *, media: any = None, **kwargs) -> dict:
+        entities = [{'media_id': await self._upload_with_alt(m), 'tagged_users': m.get('tagged_users', [])}
+                    for m in media or []]
+        return await self.gql('POST', Operation.CreateTweet, self._tweet_variables(text, entities, **kwargs))
+
+    async def schedule_tweet(self, text: str, date: int | str, *, media: list = None) -> dict:
+        media_ids = [await self._upload_with_alt(m) for m in media or []]
+        return await self.gql('POST', Operation.CreateScheduledTweet, self._scheduled_variables(text, date, media_ids))
+
+    async def schedule_reply(self, text: str, date: int | str, tweet_id: int, *, media: list = None) -> dict:
+        media_ids = [await self._upload_with_alt(m) for m in media or []]
+        variables = self._scheduled_variables(text, date, media_ids, tweet_id)
+        return await self.gql('POST', Operation.CreateScheduledTweet, variables)
+
+    async def update_list_banner(self, list_id: int, media: str) -> dict:
+        media_id = await self._upload_media(media)
+        variables = {'listId': list_id, 'mediaId': media_id}
+        return await self.gql('POST', Operation.EditListBanner, variables)
+
+    async def update_profile_image(self, media: str) -> Response:
+        media_id = await self._upload_media(media, is_profile=True)
+        url = f'{self.v1_api}/account/update_profile_image.json'
+        return await self._send('POST', url, headers=self.headers, params={'media_id': media_id})
+
+    async def update_profile_banner(self, media: str) -> Response:
+        media_id = await self._upload_media(media, is_profile=True)
+        url = f'{self.v1_api}/account/update_profile_banner.json'
+        return await self._send('POST', url, headers=self.headers, params={'media_id': media_id})
+
+    async def update_profile_info(self, **kwargs) -> Response:
+        url = f'{self.v1_api}/account/update_profile.json'
+        return await self._send('POST', url, headers=self.headers, params=kwargs)
+
+    async def update_search_settings(self, settings: dict) -> Response:
+        twid = int(self.session.cookies.get('twid').split('=')[-1].strip('"'))
+        return await self._send(
+            'POST',
+            url=f'{self.v1_api}/strato/column/User/{twid}/search/searchSafety',
+            headers=self.headers,
+            json=settings,
+        )
+
+    async def change_password(self, old: str, new: str) -> dict:
+        params = {
+            'current_password': old,
+            'password': new,
+            'password_confirmation': new
+        }
+        url = 'https://twitter.com/i/api/i/account/change_password.json'
+        r = await self._send('POST', url, headers=self.form_headers, content=urlencode(params))
+        return r.json()
+
+    async def remove_interests(self, *args):
+        """
+        Pass 'all' to remove all interests
+        """
+        r = await self._send(
+            'GET',
+            f'{self.v1_api}/account/personalization/twitter_interests.json',
+            headers=self.headers
+        )
+        current_interests = r.json()['interested_in']
+        if args == 'all':
+            disabled_interests = [x['id'] for x in current_interests]
+        else:
+            disabled_interests = [x['id'] for x in current_interests if x['display_name'] in args]
+        payload = {
+            "preferences": {
+                "interest_preferences": {
+                    "disabled_interests": disabled_interests,
+                    "disabled_partner_interests": []
+                }
+            }
+        }
+        return await self._send(
+            'POST',
+            f'{self.v1_api}/account/personalization/p13n_preferences.json',
+            headers=self.headers,
+            json=payload
+        )
+
+    def _many(self, action: str, ids: list, *args, **kwargs):
+        return self.run_many(action, ids, *args, **kwargs)
+
+    async def _paginate(self, method: str, operation: tuple, variables: dict, limit: int) -> list[dict]:
+        initial_data = await self.gql(method, operation, variables)
+        res = [initial_data]
+        ids = set(find_key(initial_data, 'rest_id'))
+        dups = 0
+        DUP_LIMIT = 3
+
+        cursor = get_cursor(initial_data)
+        while (dups < DUP_LIMIT) and cursor:
+            prev_len = len(ids)
+            if prev_len >= limit:
+                return res
+
+            data = await self.gql(method, operation, variables | {'cursor': cursor})
+
+            cursor = get_cursor(data)
+            ids |= set(find_key(data, 'rest_id'))
+
+            if self.debug:
+                logger.debug(f'cursor: {cursor}\tunique results: {len(ids)}')
+
+            if prev_len == len(ids):
+                dups += 1
+
+            res.append(data)
+        return res
+
+    async def _upload_with_alt(self, media: dict) -> int:
+        media_id = await self._upload_media(media['media'])
+        if alt := media.get('alt'):
+            await self._add_alt_text(media_id, alt)
+        return media_id
+
+    async def _upload_media(self, filename: str, is_dm: bool = False, is_profile=False) -> int | None:
+        url = 'https://upload.twitter.com/i/media/upload.json'
+        file = Path(filename)
+        params = self._upload_params(file, is_dm)
+        r = await self._send('POST', url=url, headers=self.headers, params=params)
+        if r.status_code >= 400:
+            raise Exception(f'{r.text}')
+
+        media_id = r.json()['media_id']
+
+        desc = f"uploading: {file.name}"
+        with tqdm(total=params['total_bytes'], desc=desc, unit='B', unit_scale=True, unit_divisor=1024) as pbar:
+            async with aiofiles.open(file, 'rb') as fp:
+                i = 0
+                while chunk := await fp.read(UPLOAD_CHUNK_SIZE):
+                    params = {'command': 'APPEND', 'media_id': media_id, 'segment_index': i}
+                    try:
+                        _headers, data = self._multipart(chunk)
+                        r = await self._send('POST', url=url, headers=self.headers | _headers, params=params,
+                                             content=data)
+                    except Exception as e:
+                        logger.error(f'Failed to upload chunk, trying alternative method: {e}')
+                        try:
+                            r = await self._send('POST', url=url, headers=self.headers, params=params,
+                                                 files={'media': chunk})
+                        except Exception as e:
+                            logger.error(f'Failed to upload chunk: {e}')
+                            return
+
+                    if r.status_code < 200 or r.status_code > 299:
+                        logger.debug(f'{r.status_code} {r.text}')
+
+                    i += 1
+                    pbar.update(len(chunk))
+
+        params = {'command': 'FINALIZE', 'media_id': media_id, 'allow_async': 'true'}
+        if is_dm:
+            params |= {'original_md5': hashlib.md5(file.read_bytes()).hexdigest()}
+        r = await self._send('POST', url=url, headers=self.headers, params=params)
+        if r.status_code == 400:
+            logger.debug(f'{r.status_code} {r.text}')
+            return
+
+        processing_info = r.json().get('processing_info')
+        while processing_info:
+            state = processing_info['state']
+            if error := processing_info.get("error"):
+                logger.debug(f'{error}')
+                return
+            if state == MEDIA_UPLOAD_SUCCEED:
+                break
+            if state == MEDIA_UPLOAD_FAIL:
+                logger.debug(f'{r.status_code} {r.text}')
+                return
+            await asyncio.sleep(processing_info.get('check_after_secs', random.randint(1, 5)))
+            params = {'command': 'STATUS', 'media_id': media_id}
+            r = await self._send('GET', url=url, headers=self.headers, params=params)
+            processing_info = r.json().get('processing_info')
+        return media_id
+
+    async def _add_alt_text(self, media_id: int, text: str) -> Response:
+        params = {"media_id": media_id, "alt_text": {"text": text}}
+        url = f'{self.v1_api}/media/metadata/create.json'
+        return await self._send('POST', url, headers=self.headers, json=params)
@@ -0,0 +1,195 @@
+import gzip
+import io
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Iterator
+
+import orjson
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {'zstd': '.ndjson.zst', 'gzip': '.ndjson.gz'}
+
+
+class Archive:
+    """
+    Append raw pages to compressed NDJSON segments instead of writing one file per page.
+
+    Each operation gets its own directory of numbered segments, e.g. `archive/Followers/000000.ndjson.zst`,
+    rotated once a segment reaches `segment_size` bytes. Every page is compressed as a separate frame
+    (zstd frames and gzip members can be concatenated), so a segment can be read back sequentially
+    as a whole, or a single page can be read from its offset.
+
+    Alongside the segments, `index.ndjson` holds one line per page:
+    `{"query": {...}, "cursor": ..., "segment": ..., "offset": ..., "length": ..., "time": ...}`
+
+    Not thread-safe; `Scraper` only calls `write` from its writer thread.
+    """
+
+    def __init__(self, path: str | Path = 'data/archive', segment_size: int = 64 * 1024 ** 2,
+                 compression: str = None, level: int = None):
+        """
+        @param path: root directory of the archive
+        @param segment_size: compressed size in bytes after which a new segment is started
+        @param compression: `zstd` or `gzip`, defaults to `zstd` if the `zstandard` package is installed
+        @param level: compression level, defaults to 3 for zstd and 6 for gzip
+        """
+        if compression is None:
+            compression = 'zstd' if zstandard else 'gzip'
+        if compression not in EXTENSIONS:
+            raise Exception(f'Unknown compression {compression!r}, expected one of {list(EXTENSIONS)}')
+        if compression == 'zstd' and not zstandard:
+            raise Exception('zstd compression requires the `zstandard` package: pip install zstandard')
+        self.path = Path(path)
+        self.segment_size = segment_size
+        self.compression = compression
+        self.level = level
+        self._compressor = None
+        self._segments = {}  # operation name -> (segment file, index file)
+
+    def write(self, name: str, query: dict, cursor: str | None, content: bytes) -> None:
+        """
+        Append one raw page to the current segment of an operation, and record it in the index.
+
+        @param name: operation name, e.g. `Followers`
+        @param query: variables identifying the query, without the cursor
+        @param cursor: cursor the page was requested with, `None` for the first page
+        @param content: raw response body, must be valid JSON
+        """
+        seg, index = self._open(name)
+        if b'\n' in content:
+            content = orjson.dumps(orjson.loads(content))  # one page per line
+        frame = self._compress(content + b'\n')
+        offset = seg.tell()
+        seg.write(frame)
+        seg.flush()
+        index.write(orjson.dumps({
+            'query': query,
+            'cursor': cursor,
+            'segment': Path(seg.name).name,
+            'offset': offset,
+            'length': len(frame),
+            'time': time.time_ns(),
+        }) + b'\n')
+        index.flush()
+        if seg.tell() >= self.segment_size:
+            seg.close()
+            self._segments[name] = (self._new_segment(name), index)
+
+    def close(self) -> None:
+        for seg, index in self._segments.values():
+            seg.close()
+            index.close()
+        self._segments.clear()
+
+    def index(self, name: str) -> list[dict]:
+        """
+        Index entries of an operation, in the order the pages were written.
+        """
+        path = self.path / name / 'index.ndjson'
+        if not path.exists():
+            return []
+        return [orjson.loads(line) for line in path.read_bytes().splitlines() if line]
+
+    def get(self, name: str, entry: dict) -> dict:
+        """
+        Read a single page given its index entry.
+        """
+        return orjson.loads(self.get_raw(name, entry))
+
+    def get_raw(self, name: str, entry: dict) -> bytes:
+        with open(self.path / name / entry['segment'], 'rb') as f:
+            f.seek(entry['offset'])
+            frame = f.read(entry['length'])
+        return self._decompress(entry['segment'], frame)
+
+    def operations(self) -> list[str]:
+        return sorted(p.parent.name for p in self.path.glob('*/index.ndjson'))
+
+    def read(self, name: str) -> Iterator[dict]:
+        """
+        Read every page of an operation sequentially, segment by segment.
+        """
+        for path in self.segments(name):
+            with self._reader(path) as f:
+                for line in f:
+                    yield orjson.loads(line)
+
+    def segments(self, name: str) -> list[Path]:
+        return sorted(p for ext in EXTENSIONS.values() for p in (self.path / name).glob(f'*{ext}'))
+
+    def ingest(self, path: str | Path) -> int:
+        """
+        Move pages saved with `save=True` into the archive, oldest first.
+
+        The original files are left in place. Their directory name (the query values joined by `_`)
+        is recorded as the query, as the variable names were not kept.
+
+        @param path: output directory of the scraper, e.g. `data`
+        @return: number of pages archived
+        """
+        expr = re.compile(r'^(\d+)_(\w+)\.json$')
+        files = []
+        for p in Path(path).rglob('*.json'):
+            if self.path in p.parents:
+                continue
+            if m := expr.match(p.name):
+                files.append((int(m[1]), m[2], p))
+        n = 0
+        for _, name, p in sorted(files):
+            try:
+                content = p.read_bytes()
+                orjson.loads(content)
+            except (OSError, orjson.JSONDecodeError) as e:
+                logger.warning(f'Skipping {p}: {e}')
+                continue
+            self.write(name, {'query': p.parent.name}, None, content)
+            n += 1
+        return n
+
+    def _open(self, name: str) -> tuple:
+        if name not in self._segments:
+            d = self.path / name
+            d.mkdir(parents=True, exist_ok=True)
+            # keep appending to the last segment of a previous run if it has room
+            segments = self.segments(name)
+            if (segments and segments[-1].name.endswith(EXTENSIONS[self.compression])
+                    and segments[-1].stat().st_size < self.segment_size):
+                seg = open(segments[-1], 'ab')
+            else:
+                seg = self._new_segment(name)
+            self._segments[name] = (seg, open(d / 'index.ndjson', 'ab'))
+        return self._segments[name]
+
+    def _new_segment(self, name: str):
+        segments = self.segments(name)
+        n = int(segments[-1].name.split('.')[0]) + 1 if segments else 0
+        return open(self.path / name / f'{n:06d}{EXTENSIONS[self.compression]}', 'ab')
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == 'zstd':
+            if self._compressor is None:
+                self._compressor = zstandard.ZstdCompressor(level=self.level or 3)
+            return self._compressor.compress(data)
+        return gzip.compress(data, compresslevel=self.level or 6, mtime=0)
+
+    @staticmethod
+    def _decompress(segment: str, frame: bytes) -> bytes:
+        if segment.endswith(EXTENSIONS['zstd']):
+            return zstandard.ZstdDecompressor().decompress(frame)
+        return gzip.decompress(frame)
+
+    @staticmethod
+    def _reader(path: Path):
+        if path.name.endswith(EXTENSIONS['zstd']):
+            reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True,
+                                                                closefd=True)
+            return io.BufferedReader(reader)
+        return gzip.open(path, 'rb')
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# (actions, seconds) per account, from https://help.twitter.com/en/rules-and-policies/twitter-limits
+# retweets count towards the daily tweet limit
+ACTION_LIMITS = {
+    'follow': (400, 86400),
+    'like': (1000, 86400),
+    'retweet': (2400, 86400),
+    'add_list_member': (1000, 86400),
+}
+
+# error codes meaning the action had already been applied
+ALREADY_DONE = {139, 160, 327}
+
+# error codes meaning the account is rate limited, besides a 429 status
+RATE_LIMITED = {88}
+
+# error codes of transient failures worth retrying: over capacity, internal error
+TRANSIENT = {130, 131}
+
+
+@dataclass
+class Outcome:
+    id: int | str
+    ok: bool
+    response: dict | None = None
+    error: str | None = None
+    resumed: bool = False  # applied in a previous run, not sent again
+
+
+class ActionLimiter:
+    """
+    Client-side caps on write actions (follows, likes, ...), which are limited per account over hours or days
+    and, unlike reads, carry no `x-rate-limit-*` headers to pace against.
+
+    Tracks the time of every action in a sliding window per action type.
+    """
+
+    def __init__(self, limits: dict[str, tuple[int, float] | None] = None):
+        """
+        @param limits: `(actions, seconds)` per action, merged over `ACTION_LIMITS`. `None` removes a limit.
+        """
+        self.limits = ACTION_LIMITS | (limits or {})
+        self.history: dict[str, deque] = {}
+
+    def wait_time(self, action: str) -> float:
+        """
+        Seconds until the action is allowed again, 0 if it is allowed now.
+        """
+        if not (limit := self.limits.get(action)):
+            return 0
+        n, period = limit
+        history = self.history.setdefault(action, deque())
+        now = time.time()
+        while history and history[0] <= now - period:
+            history.popleft()
+        return 0 if len(history) < n else history[0] + period - now
+
+    async def acquire(self, action: str, wait: bool = True) -> bool:
+        """
+        Take a slot for an action, waiting for one to free up if `wait` is set.
+
+        @return: whether a slot was taken
+        """
+        while delay := self.wait_time(action):
+            if not wait:
+                return False
+            logger.debug(f'{action}: action limit reached, waiting {delay:.0f} seconds')
+            await asyncio.sleep(delay)
+        if action in self.limits and self.limits[action]:
+            self.history[action].append(time.time())
+        return True
+
+    def release(self, action: str) -> None:
+        """
+        Give back the latest slot of an action that never took effect.
+        """
+        if history := self.history.get(action):
+            history.pop()
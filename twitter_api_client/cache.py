@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+HOUR = 60 * 60
+
+# profiles and single tweets change slowly, timelines are only reused for a few minutes
+DEFAULT_TTLS = {
+    'UserByScreenName': 6 * HOUR,
+    'UserByRestId': 6 * HOUR,
+    'UsersByRestIds': 6 * HOUR,
+    'ProfileSpotlightsQuery': 6 * HOUR,
+    'TweetResultByRestId': HOUR,
+    'TweetStats': HOUR,
+    'TweetDetail': 10 * 60,
+    'UserTweets': 10 * 60,
+    'UserTweetsAndReplies': 10 * 60,
+    'UserMedia': 10 * 60,
+    'Likes': 10 * 60,
+    'Followers': 10 * 60,
+    'Following': 10 * 60,
+    'Retweeters': 10 * 60,
+    'Favoriters': 10 * 60,
+}
+
+
+class Cache:
+    """
+    On-disk cache of raw GraphQL responses, keyed by `(qid, name, variables)`.
+
+    Entries expire after a per-operation TTL, and once the cache grows past `max_size` bytes
+    the least recently used entries are evicted. Operations with no TTL are not cached.
+    Backed by a single SQLite file, so it can be shared between runs and threads.
+    """
+
+    def __init__(self, path: str | Path = 'data/cache.db', ttl: dict[str, float] = None, default_ttl: float = None,
+                 max_size: int = 1024 ** 3):
+        """
+        @param path: SQLite database file
+        @param ttl: seconds to keep responses of each operation, merged over `DEFAULT_TTLS`
+        @param default_ttl: seconds to keep responses of operations missing from `ttl`, `None` to not cache them
+        @param max_size: max total size of cached responses in bytes
+        """
+        self.path = Path(path)
+        self.ttl = DEFAULT_TTLS | (ttl or {})
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        ''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._size = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def ttl_for(self, name: str) -> float | None:
+        return self.ttl.get(name, self.default_ttl)
+
+    @staticmethod
+    def key(qid: str, name: str, variables: dict) -> str:
+        raw = orjson.dumps([qid, name, variables], option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.sha1(raw).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT content, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row and row[1] > now:
+                self._db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+
+    def set(self, key: str, name: str, content: bytes) -> None:
+        if (ttl := self.ttl_for(name)) is None:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                             (key, name, content, len(content), now + ttl, now))
+            self._size += len(content) - (old[0] if old else 0)
+            if self._size > self.max_size:
+                self._evict(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _evict(self, now: float) -> None:
+        # drop expired entries first, then the least recently used until 10% under the limit
+        self._db.execute('DELETE FROM responses WHERE expires <= ?', (now,))
+        self._size = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        excess = self._size - int(self.max_size * 0.9)
+        if excess <= 0:
+            return
+        keys, freed = [], 0
+        for key, size in self._db.execute('SELECT key, size FROM responses ORDER BY accessed'):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany('DELETE FROM responses WHERE key = ?', keys)
+        self._size -= freed
+        logger.debug(f'Evicted {len(keys)} cached responses ({freed} bytes)')
@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import orjson
+
+
+class Checkpoints:
+    """
+    Crash-safe pagination state: the latest cursor and the IDs seen so far for each `(operation, query)`.
+
+    `Scraper` records a checkpoint after every page, so re-running the same call continues each chain from
+    its last cursor, and chains that already finished are skipped. Backed by a single SQLite file.
+    """
+
+    def __init__(self, path: str | Path = 'data/checkpoints.db'):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS chains (
+                operation TEXT NOT NULL,
+                query TEXT NOT NULL,
+                cursor TEXT,
+                done INTEGER NOT NULL DEFAULT 0,
+                pages INTEGER NOT NULL DEFAULT 0,
+                updated REAL NOT NULL,
+                PRIMARY KEY (operation, query)
+            )
+        ''')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS seen (
+                operation TEXT NOT NULL,
+                query TEXT NOT NULL,
+                id TEXT NOT NULL,
+                PRIMARY KEY (operation, query, id)
+            ) WITHOUT ROWID
+        ''')
+
+    @staticmethod
+    def key(query: dict) -> str:
+        return orjson.dumps(query, option=orjson.OPT_SORT_KEYS, default=str).decode()
+
+    def load(self, name: str, query: dict) -> tuple[str | None, bool, set[str]]:
+        """
+        @return: latest cursor, whether the chain finished, and the IDs seen so far
+        """
+        q = self.key(query)
+        with self._lock:
+            row = self._db.execute('SELECT cursor, done FROM chains WHERE operation = ? AND query = ?',
+                                   (name, q)).fetchone()
+            if not row:
+                return None, False, set()
+            ids = {r[0] for r in self._db.execute('SELECT id FROM seen WHERE operation = ? AND query = ?', (name, q))}
+        return row[0], bool(row[1]), ids
+
+    def save(self, name: str, query: dict, cursor: str | None, ids: set[str], done: bool) -> None:
+        """
+        Record a page: its next cursor, the IDs it added, and whether the chain is finished.
+        """
+        q = self.key(query)
+        with self._lock:
+            self._db.execute('BEGIN')
+            try:
+                self._db.execute('''
+                    INSERT INTO chains (operation, query, cursor, done, pages, updated) VALUES (?, ?, ?, ?, 1, ?)
+                    ON CONFLICT (operation, query)
+                    DO UPDATE SET cursor = excluded.cursor, done = excluded.done, pages = pages + 1,
+                                  updated = excluded.updated
+                ''', (name, q, cursor, int(done), time.time()))
+                self._db.executemany('INSERT OR IGNORE INTO seen VALUES (?, ?, ?)', ((name, q, i) for i in ids))
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+
+    def reset(self, name: str = None, query: dict = None) -> None:
+        """
+        Forget the checkpoints of one chain, of every chain of an operation, or of everything.
+        """
+        where, args = '', ()
+        if name is not None:
+            where, args = ' WHERE operation = ?', (name,)
+            if query is not None:
+                where, args = where + ' AND query = ?', args + (self.key(query),)
+        with self._lock:
+            self._db.execute(f'DELETE FROM chains{where}', args)
+            self._db.execute(f'DELETE FROM seen{where}', args)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
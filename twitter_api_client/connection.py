@@ -0,0 +1,58 @@
+import logging
+from dataclasses import dataclass
+
+from httpx import Limits, Timeout
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+
+@dataclass
+class ConnectionProfile:
+    """
+    Connection pool, keepalive, timeout and HTTP version settings for the shared `AsyncClient`s.
+
+    The connection limit stays at 100, enough for `Scraper`'s 50 concurrent chains and for media downloads.
+    Up to 20 idle connections are kept alive and reused, so pages mostly skip the TLS handshake. The
+    keepalive pool is not made any larger, because httpcore scans every pooled connection for each queued
+    request, and past a few dozen connections that CPU cost outweighs the handshakes saved
+    (see `scripts/bench_connections.py`).
+    Waiting for a free connection has no time limit (`pool_timeout=None`), so a burst of requests queues up
+    instead of failing with `PoolTimeout`. Connect, read and write timeouts still apply to every request.
+    HTTP/2 multiplexes concurrent requests over a single connection, and is used by default
+    when the optional `h2` package is installed (`pip install httpx[http2]`).
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 20.0
+    write_timeout: float = 20.0
+    pool_timeout: float | None = None
+    http2: bool | None = None
+
+    @property
+    def limits(self) -> Limits:
+        return Limits(max_connections=self.max_connections,
+                      max_keepalive_connections=self.max_keepalive_connections,
+                      keepalive_expiry=self.keepalive_expiry)
+
+    @property
+    def timeout(self) -> Timeout:
+        return Timeout(connect=self.connect_timeout, read=self.read_timeout, write=self.write_timeout,
+                       pool=self.pool_timeout)
+
+    def client_kwargs(self) -> dict:
+        """
+        Keyword arguments for `AsyncClient`.
+        """
+        http2 = HTTP2 if self.http2 is None else self.http2
+        if http2 and not HTTP2:
+            logger.warning('HTTP/2 requires the `h2` package: pip install httpx[http2], using HTTP/1.1')
+            http2 = False
+        return {'limits': self.limits, 'timeout': self.timeout, 'http2': http2}
@@ -32,6 +32,19 @@ ID_MAP = {
     'Favoriters': '^user-\d+$'
 }
 
+# known locations of the timeline instructions within `data`, checked before searching the whole response
+INSTRUCTION_PATHS = (
+    ('user', 'result', 'timeline_v2', 'timeline', 'instructions'),  # UserTweets, UserTweetsAndReplies, UserMedia, Likes
+    ('user', 'result', 'timeline', 'timeline', 'instructions'),  # Followers, Following, legacy timelines
+    ('threaded_conversation_with_injections_v2', 'instructions'),  # TweetDetail
+    ('retweeters_timeline', 'timeline', 'instructions'),  # Retweeters
+    ('favoriters_timeline', 'timeline', 'instructions'),  # Favoriters
+    ('connect_tab_timeline', 'timeline', 'instructions'),  # ConnectTabTimeline
+    ('bookmark_timeline_v2', 'timeline', 'instructions'),  # Bookmarks
+    ('home', 'home_timeline_urt', 'instructions'),  # HomeTimeline, HomeLatestTimeline
+    ('search_by_raw_query', 'search_timeline', 'timeline', 'instructions'),  # SearchTimeline
+)
+
 
 @dataclass
 class SpaceCategory:
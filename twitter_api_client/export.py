@@ -0,0 +1,260 @@
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .errors import TwitterAPIError
+from .models import ExtendedMedia, Tweet, User
+from .normalize import normalize_resp
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _int(value) -> int | None:
+    return int(value) if value else None
+
+
+def _video_url(media) -> str | None:
+    if not isinstance(media, ExtendedMedia) or not media.data_info:
+        return None
+    variants = [v for v in media.data_info.get('variants', []) if v.get('content_type') == 'video/mp4']
+    return max(variants, key=lambda v: v.get('bitrate', 0))['url'] if variants else None
+
+
+def _duration_ms(media) -> int | None:
+    if isinstance(media, ExtendedMedia) and media.data_info:
+        return media.data_info.get('duration_millis')
+
+
+def _schema() -> dict[str, list[tuple[str, 'pa.DataType', Callable]]]:
+    """
+    Columns of each table: name, Arrow type, and how to get the value from a normalized object.
+    Low-cardinality strings (language, media type, ...) are dictionary-encoded.
+    """
+    category = pa.dictionary(pa.int32(), pa.string())
+    timestamp = pa.timestamp('s', tz='UTC')
+    return {
+        'tweets': [
+            ('id', pa.int64(), lambda t: t.id),
+            ('created_at', timestamp, lambda t: _timestamp(t.created_at)),
+            ('author_id', pa.int64(), lambda t: t.author.id),
+            ('text', pa.string(), lambda t: t.text),
+            ('language', category, lambda t: t.language),
+            ('conversation_id', pa.int64(), lambda t: t.conversation_id),
+            ('in_reply_to_status_id', pa.int64(), lambda t: t.in_reply_to_status_id),
+            ('in_reply_to_user_id', pa.int64(), lambda t: _int(t.in_reply_to_user_id_str)),
+            ('quoted_status_id', pa.int64(), lambda t: t.quoted_status_id),
+            ('retweeted_status_id', pa.int64(), lambda t: t.retweeted_status_id),
+            ('retweet_count', pa.int64(), lambda t: t.public_metrics.retweet_count),
+            ('like_count', pa.int64(), lambda t: t.public_metrics.like_count),
+            ('reply_count', pa.int64(), lambda t: t.public_metrics.reply_count),
+            ('quote_count', pa.int64(), lambda t: t.public_metrics.quote_count),
+            ('bookmark_count', pa.int64(), lambda t: t.public_metrics.bookmark_count),
+            ('view_count', pa.int64(), lambda t: t.public_metrics.view_count),
+            ('urls', pa.list_(pa.string()), lambda t: [u.get('expanded_url') for u in t.urls or []]),
+            ('media_count', pa.int16(), lambda t: len(t.media or [])),
+        ],
+        'users': [
+            ('id', pa.int64(), lambda u: u.id),
+            ('username', pa.string(), lambda u: u.username),
+            ('name', pa.string(), lambda u: u.name),
+            ('description', pa.string(), lambda u: u.description),
+            ('created_at', timestamp, lambda u: _timestamp(u.created_at)),
+            ('location', pa.string(), lambda u: u.location),
+            ('url', pa.string(), lambda u: u.url),
+            ('link_url', pa.string(), lambda u: u.link_url),
+            ('verified', pa.bool_(), lambda u: u.verified),
+            ('verified_type', category, lambda u: u.verified_type),
+            ('is_blue_verified', pa.bool_(), lambda u: u.is_blue_verified),
+            ('can_dm', pa.bool_(), lambda u: u.can_dm),
+            ('protected', pa.bool_(), lambda u: u.protected),
+            ('profile_image_url', pa.string(), lambda u: u.profile_image_url),
+            ('profile_banner_url', pa.string(), lambda u: u.profile_banner_url),
+            ('followers_count', pa.int64(), lambda u: u.public_metrics.followers_count),
+            ('friends_count', pa.int64(), lambda u: u.public_metrics.friends_count),
+            ('tweet_count', pa.int64(), lambda u: u.public_metrics.tweet_count),
+            ('listed_count', pa.int64(), lambda u: u.public_metrics.listed_count),
+            ('like_count', pa.int64(), lambda u: u.public_metrics.like_count),
+            ('media_count', pa.int64(), lambda u: u.public_metrics.media_count),
+        ],
+        'media': [
+            # rows are (tweet id, media) pairs
+            ('tweet_id', pa.int64(), lambda r: r[0]),
+            ('id', pa.int64(), lambda r: r[1].id),
+            ('type', category, lambda r: r[1].type),
+            ('url', pa.string(), lambda r: r[1].url),
+            ('expanded_url', pa.string(), lambda r: r[1].expanded_url),
+            ('display_url', pa.string(), lambda r: r[1].display_url),
+            ('width', pa.int32(), lambda r: r[1].width),
+            ('height', pa.int32(), lambda r: r[1].height),
+            ('alt', pa.string(), lambda r: r[1].alt),
+            ('video_url', pa.string(), lambda r: _video_url(r[1])),
+            ('duration_ms', pa.int64(), lambda r: _duration_ms(r[1])),
+        ],
+    }
+
+
+class ArrowExporter:
+    """
+    Flatten normalized tweets, users and media into typed Arrow columns, in batches.
+
+    Objects are appended to per-column buffers and converted to a `RecordBatch` every `batch_size` rows.
+    With a `path`, each batch is written to `tweets.parquet`, `users.parquet` and `media.parquet` as it
+    fills up, so the buffered rows are bounded by the batch size. Without one, the batches are kept and `tables()`
+    returns them as `pyarrow.Table`s.
+
+    Quoted and retweeted tweets get their own rows, and authors are added to the users table.
+    Tweets, users and media are de-duplicated by ID, which keeps every ID seen in memory: that set grows with
+    the number of unique rows (about 75 bytes per ID), not with the batch size. For exports of tens of millions
+    of rows, pass `dedup=False` to keep memory bounded and de-duplicate afterwards,
+    e.g. with `SELECT DISTINCT ON (id) *` in DuckDB. Authors then get a row per tweet.
+    """
+
+    def __init__(self, path: str | Path = None, batch_size: int = 65536, compression: str = 'zstd',
+                 dedup: bool = True):
+        """
+        @param path: directory to write Parquet files to
+        @param batch_size: rows per record batch (and Parquet row group)
+        @param compression: Parquet compression codec
+        @param dedup: skip tweets, users and media whose ID was already added
+        """
+        if pa is None:
+            raise Exception('Arrow export requires the `pyarrow` package: pip install pyarrow')
+        self.path = Path(path) if path else None
+        self.batch_size = batch_size
+        self.compression = compression
+        self.schema = _schema()
+        self.columns = {name: [[] for _ in spec] for name, spec in self.schema.items()}
+        self.batches = {name: [] for name in self.schema}
+        self.dedup = dedup
+        self.seen = {name: set() for name in self.schema}
+        self._writers = {}
+
+    def add_page(self, data: dict) -> None:
+        """
+        Normalize a raw page, e.g. an element of `Scraper.tweets` or `Scraper.followers`, and add its objects.
+        """
+        try:
+            objs = normalize_resp(data)
+        except TwitterAPIError as e:
+            logger.warning(f'Skipping page: {e}')
+            return
+        for obj in objs:
+            self.add(obj)
+
+    def add(self, obj: Tweet | User) -> None:
+        if isinstance(obj, Tweet):
+            self._add_tweet(obj)
+        elif isinstance(obj, User):
+            self._append('users', obj.id, obj)
+
+    def tables(self) -> dict[str, 'pa.Table']:
+        """
+        Tables of everything added so far, when exporting to memory.
+        """
+        self.flush()
+        return {name: pa.Table.from_batches(batches, self._arrow_schema(name))
+                for name, batches in self.batches.items()}
+
+    def flush(self) -> None:
+        for name in self.schema:
+            self._flush(name)
+
+    def close(self) -> dict[str, Path]:
+        """
+        Write the remaining rows and close the Parquet files.
+
+        @return: Parquet file of each table
+        """
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        paths = {name: self.path / f'{name}.parquet' for name in self._writers}
+        self._writers = {}
+        return paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _add_tweet(self, tweet: Tweet) -> None:
+        if self.dedup and tweet.id in self.seen['tweets']:
+            return
+        self._append('tweets', tweet.id, tweet)
+        self._append('users', tweet.author.id, tweet.author)
+        for media in tweet.media or []:
+            self._append('media', media.id, (tweet.id, media))
+        for status in (tweet.quoted_status, tweet.retweeted_status):
+            if isinstance(status, Tweet):
+                self._add_tweet(status)
+
+    def _append(self, name: str, _id: int, obj) -> None:
+        if self.dedup:
+            seen = self.seen[name]
+            if _id in seen:
+                return
+            seen.add(_id)
+        for column, (_, _, get) in zip(self.columns[name], self.schema[name]):
+            column.append(get(obj))
+        if len(self.columns[name][0]) >= self.batch_size:
+            self._flush(name)
+
+    def _flush(self, name: str) -> None:
+        columns = self.columns[name]
+        if not columns[0]:
+            return
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=dtype) for values, (_, dtype, _) in zip(columns, self.schema[name])],
+            schema=self._arrow_schema(name),
+        )
+        self.columns[name] = [[] for _ in columns]
+        if self.path is None:
+            self.batches[name].append(batch)
+            return
+        if name not in self._writers:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._writers[name] = pq.ParquetWriter(self.path / f'{name}.parquet', batch.schema,
+                                                   compression=self.compression)
+        self._writers[name].write_batch(batch)
+
+    def _arrow_schema(self, name: str) -> 'pa.Schema':
+        return pa.schema([(column, dtype) for column, dtype, _ in self.schema[name]])
+
+
+def to_arrow(pages: Iterable[dict], **kwargs) -> dict[str, 'pa.Table']:
+    """
+    Convert raw pages to Arrow tables.
+
+    @param pages: raw pages, e.g. the result of `Scraper.tweets` or `Archive.read`
+    @return: `tweets`, `users` and `media` tables
+    """
+    exporter = ArrowExporter(**kwargs)
+    for page in pages:
+        exporter.add_page(page)
+    return exporter.tables()
+
+
+def to_parquet(pages: Iterable[dict], path: str | Path = 'data/parquet', **kwargs) -> dict[str, Path]:
+    """
+    Convert raw pages to `tweets.parquet`, `users.parquet` and `media.parquet`, in batches.
+
+    @param pages: raw pages, e.g. the result of `Scraper.tweets` or `Archive.read`
+    @param path: output directory
+    @return: Parquet file of each table
+    """
+    exporter = ArrowExporter(path, **kwargs)
+    for page in pages:
+        exporter.add_page(page)
+    return exporter.close()
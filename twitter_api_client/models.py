@@ -15,6 +15,11 @@ except ImportError:
 
 
 class BaseModel(MashuMaroORJSONMixin):
+    """
+    Models are slotted dataclasses: no per-instance `__dict__`, which matters when holding millions of them.
+    """
+    __slots__ = ()
+
     def __getitem__(self, attr):
         return getattr(self, attr)
 
@@ -27,7 +32,7 @@ class BaseModel(MashuMaroORJSONMixin):
         return dataclasses.asdict(self)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Media(BaseModel):
     display_url: str
     expanded_url: str
@@ -61,27 +66,27 @@ class Media(BaseModel):
             return f"{self.media_url}:small"
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UploadMedia(BaseModel):
     path: pathlib.Path
     alt: typing.Optional[str] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class VideoVariant(BaseModel):
     bitrate: int
     content_type: str
     url: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class VideoMeta(BaseModel):
     aspect: typing.List[int]
     duration: float
     variants: typing.List[VideoVariant]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ExtendedMedia(Media):
     ext_media_availability: typing.Optional[dict] = None
     # Not available on newer twitter
@@ -111,14 +116,14 @@ class ExtendedMedia(Media):
             return None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class TombTweet(BaseModel):
     id: int
     user: NoneType = None
     text: typing.Optional[str] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class TweetMetrics(BaseModel):
     retweet_count: typing.Optional[int] = None
     like_count: typing.Optional[int] = None
@@ -128,7 +133,7 @@ class TweetMetrics(BaseModel):
     view_count: typing.Optional[int] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Tweet(BaseModel):
     id: int
     id_str: str
@@ -148,12 +153,12 @@ class Tweet(BaseModel):
     retweeted_status: typing.Optional["Tweet"] = None
     quoted_status: typing.Optional["Tweet"] = None
 
-    in_reply_to_status_id = typing.Optional[int] = None
-    quoted_status_id = typing.Optional[int] = None
-    retweeted_status_id = typing.Optional[int] = None
+    in_reply_to_status_id: typing.Optional[int] = None
+    quoted_status_id: typing.Optional[int] = None
+    retweeted_status_id: typing.Optional[int] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UserMetrics(BaseModel):
     followers_count: typing.Optional[int] = None
     tweet_count: typing.Optional[int] = None
@@ -163,7 +168,7 @@ class UserMetrics(BaseModel):
     friends_count: typing.Optional[int] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class User(BaseModel):
     username: str
     description: str
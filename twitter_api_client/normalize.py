@@ -1,8 +1,14 @@
 # Adapted from twitter-redgalaxy-client
-import re
+import itertools
+import logging
+import os
 import typing
+from concurrent.futures import ProcessPoolExecutor
+from sys import intern
 from datetime import datetime, timezone
 
+import orjson
+
 from .models import (
     TombTweet,
     User,
@@ -14,15 +20,74 @@ from .models import (
 )
 from .errors import TwitterAPIError
 
+logger = logging.getLogger(__name__)
+
+MONTHS = {m: f'{i:02d}' for i, m in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+# timeline entries by the first segment of their id, e.g. `tweet-1234`, `user-1234`
+ENTRY_TYPES = {'tweet': 'tweet', 'user': 'user'}
+
+# `UserMetrics` fields and the `legacy` keys they are read from
+USER_METRICS = (
+    ('followers_count', 'followers_count'),
+    ('tweet_count', 'statuses_count'),
+    ('listed_count', 'listed_count'),
+    ('like_count', 'favourites_count'),
+    ('media_count', 'media_count'),
+    ('friends_count', 'friends_count'),
+)
+
+
+def parse_created_at(value: str) -> str:
+    """
+    ISO 8601 timestamp of a `created_at` value like `Wed Oct 10 20:19:24 +0000 2018`.
+
+    The format is fixed, so the fields are sliced out instead of parsed with `strptime`,
+    which is an order of magnitude slower. Anything else falls back to `strptime`.
+    """
+    if len(value) == 30 and value[19:26] == ' +0000 ' and (month := MONTHS.get(value[4:7])):
+        return f'{value[26:]}-{month}-{value[8:10]}T{value[11:19]}+00:00'
+    return datetime.strptime(value, "%a %b %d %H:%M:%S +0000 %Y").replace(tzinfo=timezone.utc).isoformat()
+
+
+def entry_type(entry_id: str) -> typing.Optional[str]:
+    """
+    `tweet`, `user` or `cursor` for a timeline entry id, or `None` for entries we don't unpack.
+    """
+    head, sep, tail = entry_id.partition('-')
+    if head.startswith('cursor'):
+        return 'cursor'
+    if not sep:
+        return None
+    if head == 'sq':
+        # search: `sq-I-t-1234` tweets, `sq-C...` cursors
+        return 'tweet' if tail.startswith('I-t-') else 'cursor' if tail.startswith('C') else None
+    return ENTRY_TYPES.get(head)
+
 
 class UtilBox:
     @staticmethod
-    def make_user(user_data: dict) -> User:
+    def make_user(user_data: dict, users: typing.Optional[dict] = None) -> User:
+        """
+        @param users: identity map of the users built so far, by `rest_id`. A user already in it is
+            returned as is, with only its metrics refreshed.
+        """
         if user_data['__typename'] != 'User':
             # Maybe rate limited or blocked from accessing this data. This type of error seems
             # to be transient and per-request rather than per-object
             raise TwitterAPIError(f"{user_data['__typename']} {user_data.get('reason')}")
 
+        if users is not None:
+            legacy = user_data.get('legacy', user_data)
+            key = str(user_data.get('rest_id') or legacy.get('id'))
+            if (user := users.get(key)) is not None:
+                UtilBox.update_metrics(user.public_metrics, legacy)
+                return user
+            user = UtilBox.make_user(user_data)
+            users[key] = user
+            return user
+
         if 'legacy' in user_data:
             user_id = user_data['rest_id']
             user_data = {
@@ -61,10 +126,7 @@ class UtilBox:
         if isinstance(user_id, str):
             user_id = int(user_id)
 
-        created_at = datetime.strptime(
-            user_data["created_at"],
-            "%a %b %d %H:%M:%S +0000 %Y",
-        ).replace(tzinfo=timezone.utc).isoformat()
+        created_at = parse_created_at(user_data["created_at"])
 
         return User(
             username=username,
@@ -81,16 +143,23 @@ class UtilBox:
             profile_image_url=profile_url,
             verified_type=None
             if not user_data["verified"]
-            else user_data.get("verified_type", "Legacy"),
+            else intern(user_data.get("verified_type", "Legacy")),
             created_at=created_at,
             location=user_data.get("location", None),
             protected=False,  # probably lol
             source="unofficial",
         )
 
+    @staticmethod
+    def update_metrics(metrics: UserMetrics, user_data: dict) -> None:
+        for field, key in USER_METRICS:
+            value = user_data.get(key, 0)
+            if getattr(metrics, field) != value:
+                setattr(metrics, field, value)
+
     @staticmethod
     def common_tweet(
-        true_tweet: dict, entry_globals: typing.Optional[dict],
+        true_tweet: dict, entry_globals: typing.Optional[dict], users: typing.Optional[dict] = None,
     ):
         if true_tweet['__typename'] == 'TweetTombstone':
             # user doesn't exist anymore etc.
@@ -130,13 +199,13 @@ class UtilBox:
 
         if quoted_tweet:
             quoted_tweet = UtilBox.common_tweet(
-                quoted_tweet, entry_globals,
+                quoted_tweet, entry_globals, users,
             )
         if retweeted_tweet:
             retweeted_tweet = UtilBox.common_tweet(
-                retweeted_tweet, entry_globals,
+                retweeted_tweet, entry_globals, users,
             )
-        user = UtilBox.make_user(user_result)
+        user = UtilBox.make_user(user_result, users)
 
         text = base_tweet.get("full_text", "")
 
@@ -150,14 +219,18 @@ class UtilBox:
         bookmark_count = base_tweet.get("bookmark_count")
         view_count = true_tweet.get("views", {}).get("count", None)
         lang = base_tweet.get("lang")
+        if lang:
+            # a handful of distinct values repeated across millions of tweets, share one copy of each
+            lang = intern(lang)
 
         for link in urls:
             text = text.replace(link["url"], link["expanded_url"])
 
-        spl_content: list[str] = text.split(" ")
-        if spl_content[-1].startswith("https://t.co") and len(medias) > 0:
-            spl_content.pop(-1)
-        text = " ".join(spl_content)
+        if medias:
+            # drop the trailing t.co link to the media
+            head, _, last = text.rpartition(" ")
+            if last.startswith("https://t.co"):
+                text = head
 
         media_objs = {}
         for media in base_tweet.get("entities", {}).get("media", []):
@@ -167,7 +240,7 @@ class UtilBox:
                 features=media.get("features", {}),
                 id=int(media["id_str"]),
                 url=media["media_url_https"],
-                type=media["type"],
+                type=intern(media["type"]),
                 width=media['original_info']['width'],
                 height=media['original_info']['height'],
                 original_info=media["original_info"],
@@ -183,10 +256,10 @@ class UtilBox:
                 features=extended_media.get("features", {}),
                 id=int(extended_media["id_str"]),
                 url=extended_media["media_url_https"],
-                type=extended_media["type"],
+                type=intern(extended_media["type"]),
                 alt=extended_media.get('ext_alt_text'),
-                width=media['original_info']['width'],
-                height=media['original_info']['height'],
+                width=extended_media['original_info']['width'],
+                height=extended_media['original_info']['height'],
                 original_info=extended_media["original_info"],
             )
             if set_media.type == "video":
@@ -208,15 +281,7 @@ class UtilBox:
 
         media_objs = list(media_objs.values())
 
-        source = base_tweet.get("source", "")
-        if source:
-            source = source.replace("\\/", "/")
-            source = re.sub("<[^<]+?>", "", source)
-
-        created_at = datetime.strptime(
-            base_tweet["created_at"],
-            "%a %b %d %H:%M:%S +0000 %Y",
-        ).replace(tzinfo=timezone.utc).isoformat()
+        created_at = parse_created_at(base_tweet["created_at"])
 
         metrics = TweetMetrics(
             retweet_count=retweet_count,
@@ -226,16 +291,17 @@ class UtilBox:
             bookmark_count=int(bookmark_count) if bookmark_count is not None else None,
             view_count=int(view_count) if view_count is not None else None,
         )
-        quoted_status_id = base_tweet.get("quoted_status_id")
-        retweeted_status_id = base_tweet.get("retweeted_status_id")
+        in_reply_to_status_id = base_tweet.get('in_reply_to_status_id_str')
+        quoted_status_id = base_tweet.get("quoted_status_id_str") or base_tweet.get("quoted_status_id")
+        retweeted_status_id = base_tweet.get("retweeted_status_id_str") or base_tweet.get("retweeted_status_id")
         return Tweet(
             id=int(base_tweet["id_str"]),
             id_str=base_tweet["id_str"],
             in_reply_to_status_id_str=base_tweet.get('in_reply_to_status_id_str'),
             in_reply_to_user_id_str=base_tweet.get('in_reply_to_user_id_str'),
-            in_reply_to_status_id=int(base_tweet.get('in_reply_to_status_id_str')),
-            quoted_status_id=int(quoted_status_id),
-            retweeted_status_id=int(retweeted_status_id),
+            in_reply_to_status_id=int(in_reply_to_status_id) if in_reply_to_status_id else None,
+            quoted_status_id=int(quoted_status_id) if quoted_status_id else None,
+            retweeted_status_id=int(retweeted_status_id) if retweeted_status_id else None,
             created_at=created_at,
             text=text,
             urls=urls,
@@ -251,13 +317,14 @@ class UtilBox:
 
     @staticmethod
     def iter_timeline_data(
-        timeline: dict, cursor: dict, global_objects: dict = {}, limit: int = None, run_count=0
+        timeline: dict, cursor: dict, global_objects: dict = {}, limit: int = None, run_count=0,
+        users: typing.Optional[dict] = None,
     ):
         for i in timeline.get("instructions", []):
-            entryType = list(i.keys())[0]
+            entryType = next(iter(i))
             if entryType == "type":
                 if i[entryType] == "TimelineAddEntries":
-                    for entry in UtilBox.iter_timeline_entry(i["entries"], global_objects):
+                    for entry in UtilBox.iter_timeline_entry(i["entries"], global_objects, users):
                         if entry.get("type") == "cursor":
                             cursor[entry["direction"]] = entry
                         else:
@@ -270,14 +337,14 @@ class UtilBox:
                                     break
                 elif i[entryType] == "TimelineReplaceEntry":
                     for entry in UtilBox.iter_timeline_entry(
-                        [i["entry"]], global_objects
+                        [i["entry"]], global_objects, users
                     ):
                         if entry.get("type") == "cursor":
                             cursor[entry["direction"]] = entry
             else:
                 if entryType == "addEntries":
                     for entry in UtilBox.iter_timeline_entry(
-                        i["addEntries"]["entries"], global_objects
+                        i["addEntries"]["entries"], global_objects, users
                     ):
                         if entry.get("type") == "cursor":
                             cursor[entry["direction"]] = entry
@@ -291,35 +358,29 @@ class UtilBox:
                                     break
                 elif entryType == "replaceEntry":
                     for entry in UtilBox.iter_timeline_entry(
-                        i["addEntries"]["entries"], global_objects
+                        i["addEntries"]["entries"], global_objects, users
                     ):
                         if entry.get("type") == "cursor":
                             cursor[entry["direction"]] = entry
 
     @staticmethod
-    def iter_timeline_entry(entries: list, entry_globals: dict):
+    def iter_timeline_entry(entries: list, entry_globals: dict, users: typing.Optional[dict] = None):
         for entry in entries:
             entry_id = entry["entryId"]
-            # print(entry_id)
-            if entry_id.startswith("tweet-") or entry_id.startswith("sq-I-t-"):
-                # print(entry)
-                yield {
-                    "type": "tweet",
-                    "data": UtilBox.unpack_tweet(entry, entry_globals, entry_id),
-                }
-            elif entry_id.startswith("user-"):
-                yield {
-                    "type": "user",
-                    'data': UtilBox.unpack_user(entry, entry_globals, entry_id),
-                }
-            elif entry_id.startswith("cursor") or entry_id.startswith("sq-C"):
+            kind = entry_type(entry_id)
+            if kind == "cursor":
                 yield {
                     "type": "cursor",
                     **UtilBox.unpack_cursor(entry_id, entry["content"]),
                 }
+            elif kind:
+                yield {
+                    "type": kind,
+                    "data": UtilBox.unpackers[kind](entry, entry_globals, entry_id, users),
+                }
 
     @staticmethod
-    def unpack_user(entryData: dict, entry_globals: dict, entry_id: str):
+    def unpack_user(entryData: dict, entry_globals: dict, entry_id: str, users: typing.Optional[dict] = None):
         if entryData.get("__typename") == "TimelineTimelineItem":
             user = (
                 entryData.get("itemContent", {})
@@ -328,7 +389,7 @@ class UtilBox:
             )
             if not user:
                 raise ValueError("User data missing? [Timeline V2]")
-            user = UtilBox.make_user(user)
+            user = UtilBox.make_user(user, users)
         elif entry_id.startswith("user-"):
             user_mini = entryData.get("content", {})
             if not user_mini:
@@ -347,7 +408,7 @@ class UtilBox:
                 )
                 if not user:
                     raise ValueError("User data missing? [Timeline V2]")
-                user = UtilBox.make_user(user)
+                user = UtilBox.make_user(user, users)
                 return user
             if user_mini is None:
                 raise ValueError(
@@ -355,7 +416,7 @@ class UtilBox:
                 )
             user = entry_globals["users"][str(user_mini["content"]["user"]["id"])]
             # TODO: Need globals?
-            user = UtilBox.make_user(user)
+            user = UtilBox.make_user(user, users)
         else:
             raise ValueError(
                 f"Unseen user type? [Unknown Timeline]: {entryData}"
@@ -364,7 +425,7 @@ class UtilBox:
         return user
 
     @staticmethod
-    def unpack_tweet(entryData: dict, entry_globals: dict, entry_id: str):
+    def unpack_tweet(entryData: dict, entry_globals: dict, entry_id: str, users: typing.Optional[dict] = None):
         if entryData.get("__typename") == "TimelineTimelineItem":
             tweet = (
                 entryData.get("itemContent", {})
@@ -373,7 +434,7 @@ class UtilBox:
             )
             if not tweet:
                 raise ValueError("Tweet data missing? [Timeline V2]")
-            tweet = UtilBox.common_tweet(tweet, None)
+            tweet = UtilBox.common_tweet(tweet, None, users)
         elif entry_id.startswith("sq-I-t-") or entry_id.startswith("tweet-"):
             tweet_mini = entryData.get("content", {})
             if not tweet_mini:
@@ -396,14 +457,14 @@ class UtilBox:
                         return tweet
                     print(entryData)
                     raise ValueError("Tweet data missing? [Timeline V2]")
-                tweet = UtilBox.common_tweet(tweet, None)
+                tweet = UtilBox.common_tweet(tweet, None, users)
                 return tweet
             if tweet_mini is None:
                 raise ValueError(
                     "Failed to retrieve tweet_mini [Search Timeline]"
                 )
             tweet = entry_globals["tweets"][str(tweet_mini["content"]["tweet"]["id"])]
-            tweet = UtilBox.common_tweet(tweet, entry_globals)
+            tweet = UtilBox.common_tweet(tweet, entry_globals, users)
         else:
             raise ValueError(
                 f"Unseen Tweet type? [Unknown Timeline]: {entryData}"
@@ -445,6 +506,9 @@ class UtilBox:
                     "value": content.get("value"),
                 }
 
+    unpackers = {'tweet': unpack_tweet, 'user': unpack_user}
+
+
 def get_instructions(inner_data: dict):
     if inner_data.get('user'):
         result = inner_data['user']['result']
@@ -459,7 +523,18 @@ def get_instructions(inner_data: dict):
         return inner_data['threaded_conversation_with_injections_v2']
 
 
-def normalize_resp(data: dict):
+def normalize_resp(data: dict, users: typing.Optional[dict] = None):
+    """
+    Normalize a raw page into `Tweet`s and `User`s.
+
+    Each author is built once per page and shared by all of their tweets. Pass the same `users` dict
+    to several calls to share authors across pages, e.g. for a whole crawl.
+
+    @param data: raw page
+    @param users: identity map of users by `rest_id`, created per call if not given
+    """
+    if users is None:
+        users = {}
     inner_data: dict = data.get("data", {})
     
     instructions = get_instructions(inner_data)
@@ -468,5 +543,60 @@ def normalize_resp(data: dict):
         instructions = {}
     cursor = {}
     
-    res = list(UtilBox.iter_timeline_data(instructions, cursor))
+    res = list(UtilBox.iter_timeline_data(instructions, cursor, users=users))
     return [r for r in res if r]
+
+
+def normalize_many(pages: typing.Iterable[dict | bytes], workers: typing.Optional[int] = None, chunk_size: int = 16,
+                   as_dicts: bool = False) -> list:
+    """
+    Normalize many raw pages in parallel on a process pool.
+
+    Pages are sent to the workers in chunks as JSON, which is much cheaper to transfer than pickled dicts.
+    Authors are shared within a chunk (see `normalize_resp`), so each one is built and pickled back once
+    per chunk, and slotted models pickle as plain lists of field values.
+    Pages that fail to normalize are logged and skipped.
+
+    @param pages: raw pages, as dicts or JSON bytes, e.g. the result of `Scraper.tweets` or `Archive.read`
+    @param workers: worker processes, defaults to the number of CPUs. With 1, pages are normalized in this process.
+    @param chunk_size: pages per task
+    @param as_dicts: return plain dicts instead of models, serialized by the workers with orjson
+    @return: `Tweet`s and `User`s of all pages, in page order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = (_normalize_chunk(chunk, as_dicts) for chunk in _chunks(pages, chunk_size))
+        return [obj for res in results for obj in _decode(res)]
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(_normalize_chunk, _chunks(pages, chunk_size), itertools.repeat(as_dicts))
+        return [obj for res in results for obj in _decode(res)]
+
+
+def _chunks(pages: typing.Iterable[dict | bytes], size: int) -> typing.Iterator[list[bytes]]:
+    it = iter(pages)
+    while chunk := list(itertools.islice(it, size)):
+        yield [p if isinstance(p, bytes) else orjson.dumps(p) for p in chunk]
+
+
+def _normalize_chunk(chunk: list[bytes], as_dicts: bool) -> list | bytes:
+    users = {}
+    res = []
+    for raw in chunk:
+        res.extend(_normalize_page(orjson.loads(raw), users))
+    if as_dicts:
+        # models are dataclasses, which orjson serializes natively into one buffer,
+        # quicker to send back and decode than pickled models
+        return orjson.dumps(res)
+    return res
+
+
+def _normalize_page(data: dict, users: dict) -> list:
+    try:
+        return normalize_resp(data, users)
+    except TwitterAPIError as e:
+        logger.warning(f'Skipping page: {e}')
+        return []
+
+
+def _decode(res: list | bytes) -> list:
+    return orjson.loads(res) if isinstance(res, bytes) else res
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+
+from httpx import AsyncClient, Client, Response
+
+from .connection import ConnectionProfile
+from .ratelimit import RateLimiter
+from .util import get_headers
+
+logger = logging.getLogger(__name__)
+
+# error codes returned for suspended, locked or logged-out accounts
+LOCKOUT_CODES = {32, 64, 326}
+
+
+@dataclass
+class Member:
+    session: Client
+    client: AsyncClient
+    limiter: RateLimiter = field(default_factory=RateLimiter)
+    inflight: int = 0
+    retired_until: float = 0
+    reason: str = ''
+
+    @property
+    def healthy(self) -> bool:
+        return time.time() >= self.retired_until
+
+
+class SessionPool:
+    """
+    Spread pagination chains across many authenticated accounts.
+
+    Each account keeps its own client and rate-limit state. A chain is pinned to the account that started it,
+    and only moves to another account if that one gets retired.
+    """
+
+    def __init__(self, sessions: list[Client | dict] = (), client_kwargs: dict = {},
+                 connection: ConnectionProfile = None):
+        """
+        @param sessions: authenticated sessions, or dicts of their cookies (must include `ct0` and `auth_token`)
+        @param client_kwargs: optional keyword arguments for each account's `AsyncClient`
+        @param connection: connection settings for each account's `AsyncClient`
+        """
+        self.connection = connection or ConnectionProfile()
+        self.members: list[Member] = []
+        for session in sessions:
+            if isinstance(session, dict):
+                session = Client(cookies=session)
+            self.add(session, client_kwargs=client_kwargs)
+
+    def add(self, session: Client, client: AsyncClient = None, limiter: RateLimiter = None,
+            client_kwargs: dict = {}) -> Member:
+        if client is None:
+            client = AsyncClient(headers=get_headers(session), cookies=session.cookies,
+                                 **self.connection.client_kwargs() | client_kwargs)
+        member = Member(session, client, limiter or RateLimiter())
+        self.members.append(member)
+        return member
+
+    async def checkout(self) -> Member:
+        """
+        Lease the least-loaded healthy account, waiting for one to come back from a rate-limit cooldown if necessary.
+        """
+        while True:
+            if healthy := [m for m in self.members if m.healthy]:
+                member = min(healthy, key=lambda m: m.inflight)
+                member.inflight += 1
+                return member
+            wake = min((m.retired_until for m in self.members), default=math.inf)
+            if wake == math.inf:
+                raise Exception('No healthy accounts left in the session pool.')
+            await asyncio.sleep(wake - time.time())
+
+    def checkin(self, member: Member) -> None:
+        member.inflight = max(member.inflight - 1, 0)
+
+    def retire(self, member: Member, reason: str, until: float = math.inf) -> None:
+        if member.healthy:
+            logger.warning(f'Retiring account {self.members.index(member)}: {reason}')
+        member.retired_until = max(member.retired_until, until)
+        member.reason = reason
+
+    def inspect(self, member: Member, r: Response) -> None:
+        """
+        Retire the account behind a response if it was rate-limited or locked out.
+
+        A 429 benches the account until its window resets; lockouts and suspensions are permanent.
+        """
+        if r.status_code == 429:
+            until = float(r.headers.get('x-rate-limit-reset', time.time() + member.limiter.backoff))
+            self.retire(member, f'rate limited until {until:.0f}', until)
+        elif r.status_code in {401, 403}:
+            try:
+                codes = {e.get('code') for e in r.json().get('errors', [])}
+            except Exception:
+                return
+            if codes & LOCKOUT_CODES:
+                self.retire(member, f'locked out ({r.status_code} {sorted(codes)})')
+
+    def capacity(self, name: str) -> int | None:
+        """
+        Combined rate-limit budget of the healthy accounts for an operation, or `None` if any budget is unknown.
+        """
+        total = 0
+        for m in self.members:
+            if m.healthy:
+                if (c := m.limiter.capacity(name)) is None:
+                    return None
+                total += c
+        return total
+
+    async def aclose(self):
+        await asyncio.gather(*(m.client.aclose() for m in self.members))
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from httpx import Response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Window:
+    limit: int | None = None
+    remaining: int | None = None
+    reset: float = 0
+    pending: int = 0
+    next_slot: float = 0
+    unmetered: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    learned: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class RateLimiter:
+    """
+    Pace requests per GraphQL operation using the `x-rate-limit-*` headers Twitter returns.
+
+    Until the first response of a window arrives, a single probe request is admitted to learn the budget.
+    After that, requests go through immediately while the budget is plentiful. Once it drops to the `reserve`,
+    the rest is spread evenly over the time left until `x-rate-limit-reset`, so it lasts until the window ends
+    instead of running out in a burst.
+    """
+
+    def __init__(self, margin: float = 1.0, probe_timeout: float = 30.0, backoff: float = 60.0,
+                 reserve: float = 0.2):
+        """
+        @param margin: seconds to wait past `x-rate-limit-reset` before probing the next window
+        @param probe_timeout: max seconds to wait for the probe response before admitting another request
+        @param backoff: seconds to pause an operation after a 429 that carries no (future) reset header
+        @param reserve: fraction of the window's limit below which requests are paced
+        """
+        self.margin = margin
+        self.probe_timeout = probe_timeout
+        self.backoff = backoff
+        self.reserve = reserve
+        self.windows: dict[str, Window] = {}
+
+    async def acquire(self, name: str) -> None:
+        w = self.windows.setdefault(name, Window())
+        delay = 0
+        async with w.lock:
+            while not w.unmetered:
+                now = time.time()
+                if w.remaining is None:
+                    if not w.pending:
+                        break
+                    # a probe is in flight, wait for it to report the budget
+                    w.learned.clear()
+                    try:
+                        await asyncio.wait_for(w.learned.wait(), self.probe_timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    continue
+                if now >= w.reset:
+                    # window rolled over, budget is unknown until the next response
+                    w.remaining = None
+                    w.next_slot = 0
+                    continue
+                available = w.remaining - w.pending
+                if available <= 0:
+                    wait = w.reset - now + self.margin
+                    logger.debug(f'{name}: rate limit exhausted, waiting {wait:.2f} seconds')
+                    await asyncio.sleep(wait)
+                    continue
+                if available > self.reserve * (w.limit or w.remaining):
+                    # enough budget left for the demand, no need to pace
+                    break
+                # close to running out: take the next evenly spaced slot, and wait for it outside the lock
+                slot = max(now, w.next_slot)
+                w.next_slot = slot + (w.reset - now) / available
+                delay = slot - now
+                break
+            w.pending += 1
+        if delay:
+            logger.debug(f'{name}: rate limit nearly exhausted, pacing request by {delay:.2f} seconds')
+            await asyncio.sleep(delay)
+
+    def update(self, name: str, r: Response) -> None:
+        w = self.windows.setdefault(name, Window())
+        w.pending = max(w.pending - 1, 0)
+        headers = r.headers
+        try:
+            now = time.time()
+            if 'x-rate-limit-reset' in headers:
+                w.reset = float(headers['x-rate-limit-reset'])
+            if 'x-rate-limit-remaining' in headers:
+                w.remaining = int(headers['x-rate-limit-remaining'])
+                if 'x-rate-limit-reset' not in headers:
+                    w.reset = now + self.backoff
+                w.limit = int(headers.get('x-rate-limit-limit', w.remaining))
+                w.unmetered = False
+            elif r.is_success:
+                # only a successful response shows the endpoint is unmetered,
+                # error pages (5xx, 404, edge errors) often come without the headers
+                w.unmetered = True
+            if r.status_code == 429:
+                w.remaining = 0
+                w.unmetered = False
+                if w.reset <= now:
+                    # no reset header, or one already in the past
+                    w.reset = now + self.backoff
+        except ValueError as e:
+            logger.debug(f'{name}: invalid rate limit headers: {e}')
+        w.learned.set()
+
+    def release(self, name: str) -> None:
+        """
+        Release a slot whose request failed before a response was received.
+        """
+        w = self.windows.setdefault(name, Window())
+        w.pending = max(w.pending - 1, 0)
+        w.learned.set()
+
+    def capacity(self, name: str) -> int | None:
+        """
+        Requests the current window can still admit, or `None` if the budget is unknown or unmetered.
+        """
+        w = self.windows.get(name)
+        if not w or w.unmetered or w.remaining is None or time.time() >= w.reset:
+            return None
+        return max(w.remaining - w.pending, 0)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+
+import orjson
+from httpx import (AsyncBaseTransport, AsyncHTTPTransport, BaseTransport, HTTPTransport, Request, Response)
+
+from .archive import Archive
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(request: Request) -> tuple[str, dict, str | None]:
+    """
+    Identify a request by `(operation, query, cursor)`, the same way pages are indexed in an `Archive`.
+
+    The operation is the last path segment (`Followers`, `adaptive` for search, ...). For GraphQL requests
+    the query is the decoded `variables`, otherwise it is the query string.
+    """
+    name = request.url.path.rsplit('/', 1)[-1].removesuffix('.json')
+    params = dict(request.url.params)
+    query = orjson.loads(params['variables']) if 'variables' in params else params
+    cursor = query.pop('cursor', None)
+    return name, query, cursor
+
+
+class RecordTransport(AsyncBaseTransport, BaseTransport):
+    """
+    Pass requests through to the network and record every successful JSON response into an `Archive`.
+
+    Works with both `Client` and `AsyncClient`, e.g.
+    `Scraper(email, username, password, client_kwargs={'transport': RecordTransport(Archive('fixtures'))})`
+    """
+
+    def __init__(self, archive: Archive, transport: AsyncBaseTransport | BaseTransport = None):
+        self.archive = archive
+        self.transport = transport
+
+    def handle_request(self, request: Request) -> Response:
+        self.transport = self.transport or HTTPTransport()
+        r = self.transport.handle_request(request)
+        r.read()
+        self._record(request, r)
+        return r
+
+    async def handle_async_request(self, request: Request) -> Response:
+        self.transport = self.transport or AsyncHTTPTransport()
+        r = await self.transport.handle_async_request(request)
+        await r.aread()
+        self._record(request, r)
+        return r
+
+    def _record(self, request: Request, r: Response) -> None:
+        if r.status_code != 200 or 'json' not in r.headers.get('content-type', ''):
+            return
+        name, query, cursor = request_key(request)
+        self.archive.write(name, query, cursor, r.content)
+
+    def close(self) -> None:
+        self.archive.close()
+        if isinstance(self.transport, BaseTransport):
+            self.transport.close()
+
+    async def aclose(self) -> None:
+        self.archive.close()
+        if isinstance(self.transport, AsyncBaseTransport):
+            await self.transport.aclose()
+
+
+class ReplayTransport(AsyncBaseTransport, BaseTransport):
+    """
+    Serve responses recorded in an `Archive` instead of hitting the network.
+
+    Requests are matched on operation, query and cursor. A recorded query matches if all of its variables
+    are present in the request, so archives written by `Scraper(save=True, archive=...)` replay as well.
+    Unmatched requests get a 404, or with `strict=False`, the pages recorded for the same operation and cursor
+    are served round-robin.
+
+    Latency and the `x-rate-limit-*` headers of a live window can be simulated, so pacing and
+    backoff behave as they would against twitter.com.
+    """
+
+    def __init__(self, archive: Archive, latency: float = 0.0, jitter: float = 0.0, rate_limit: int = None,
+                 window: float = 900.0, strict: bool = True):
+        """
+        @param archive: recorded responses
+        @param latency: seconds to wait before each response
+        @param jitter: max extra random seconds added to `latency`
+        @param rate_limit: requests allowed per operation per window, `None` to send no rate-limit headers
+        @param window: length of a rate-limit window in seconds
+        @param strict: return a 404 when no recorded query matches the request
+        """
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.window = window
+        self.strict = strict
+        self.requests = 0
+        self._entries = defaultdict(list)  # (operation, cursor) -> index entries
+        for name in archive.operations():
+            for entry in archive.index(name):
+                self._entries[name, entry['cursor']].append(entry)
+        self._content = {}
+        self._turns = defaultdict(int)
+        self._windows = {}  # operation -> [remaining, reset]
+
+    def handle_request(self, request: Request) -> Response:
+        if delay := self._delay():
+            time.sleep(delay)
+        return self._respond(request)
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if delay := self._delay():
+            await asyncio.sleep(delay)
+        return self._respond(request)
+
+    def _delay(self) -> float:
+        return self.latency + (random.random() * self.jitter if self.jitter else 0)
+
+    def _respond(self, request: Request) -> Response:
+        self.requests += 1
+        name, query, cursor = request_key(request)
+        headers = {'content-type': 'application/json'}
+        if self.rate_limit is not None:
+            remaining, reset = self._take(name)
+            headers |= {
+                'x-rate-limit-limit': str(self.rate_limit),
+                'x-rate-limit-remaining': str(max(remaining, 0)),
+                'x-rate-limit-reset': str(int(reset)),
+            }
+            if remaining < 0:
+                return Response(429, headers=headers, request=request,
+                                content=b'{"errors":[{"code":88,"message":"Rate limit exceeded."}]}')
+        if (entry := self._match(name, query, cursor)) is None:
+            logger.debug(f'{name}: no recorded response for {query} at cursor {cursor}')
+            return Response(404, headers=headers, request=request,
+                            content=b'{"errors":[{"code":34,"message":"No recorded response."}]}')
+        key = (name, entry['segment'], entry['offset'])
+        if key not in self._content:
+            self._content[key] = self.archive.get_raw(name, entry)
+        return Response(200, headers=headers, content=self._content[key], request=request)
+
+    def _match(self, name: str, query: dict, cursor: str | None) -> dict | None:
+        candidates = self._entries.get((name, cursor), [])
+        for entry in candidates:
+            if all(query.get(k) == v for k, v in entry['query'].items()):
+                return entry
+        if candidates and not self.strict:
+            self._turns[name, cursor] += 1
+            return candidates[self._turns[name, cursor] % len(candidates)]
+
+    def _take(self, name: str) -> tuple[int, float]:
+        now = time.time()
+        w = self._windows.get(name)
+        if w is None or now >= w[1]:
+            w = self._windows[name] = [self.rate_limit, now + self.window]
+        w[0] -= 1
+        return w[0], w[1]
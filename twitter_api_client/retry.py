@@ -0,0 +1,61 @@
+import logging
+import random
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    When and how long to retry failed GraphQL requests.
+
+    Server errors and transport failures (timeouts, dropped connections) are retried with exponential
+    backoff and full jitter. 429s wait until the rate-limit window resets instead, as the account is benched
+    until then. Each pagination chain gets its own `Budget` of retries, so one bad chain cannot stall a crawl.
+
+    Retry counts are kept in `stats`, and requests that ran out of retries in `exhausted`,
+    both keyed by `(operation, reason)`.
+    """
+
+    def __init__(self, retries: int = 5, budget: int = 30, backoff: float = 1.0, max_backoff: float = 60.0,
+                 statuses: set[int] = frozenset({500, 502, 503, 504})):
+        """
+        @param retries: max retries of a single request
+        @param budget: max retries of all requests in a chain
+        @param backoff: base delay in seconds, doubled with every attempt
+        @param max_backoff: cap of the delay before jitter
+        @param statuses: response status codes to retry with backoff
+        """
+        self.retries = retries
+        self.budget = budget
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.stats = Counter()
+        self.exhausted = Counter()
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def new_budget(self) -> 'Budget':
+        return Budget(self)
+
+
+class Budget:
+    """
+    Retries left to a single pagination chain.
+    """
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.left = policy.budget
+
+    def allow(self, name: str, reason: str, attempt: int) -> bool:
+        if attempt >= self.policy.retries or self.left <= 0:
+            self.policy.exhausted[name, reason] += 1
+            logger.warning(f'{name}: giving up after {attempt} retries ({reason})')
+            return False
+        self.left -= 1
+        self.policy.stats[name, reason] += 1
+        logger.debug(f'{name}: retry {attempt + 1}/{self.policy.retries} ({reason}), {self.left} left in chain')
+        return True
@@ -2,14 +2,25 @@ import asyncio
 import logging
 import math
 import platform
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncGenerator, Callable
 
 import aiofiles
-from httpx import AsyncClient, Limits, ReadTimeout, URL
+from httpx import AsyncClient, ReadTimeout, Request, TimeoutException, TransportError, URL
 from tqdm.asyncio import tqdm_asyncio
 
+from .archive import Archive
+from .cache import Cache
+from .checkpoint import Checkpoints
+from .connection import ConnectionProfile
 from .constants import *
 from .login import login
+from .normalize import _normalize_chunk, _normalize_page
+from .pool import Member, SessionPool
+from .ratelimit import RateLimiter
+from .retry import Budget, RetryPolicy
 from .util import *
+from .writer import Writer
 
 
 if platform.system() != 'Windows':
@@ -27,21 +38,53 @@ logger = logging.getLogger(__name__)
 class Scraper:
     def __init__(self, email: str = None, username: str = None, password: str = None, session: Client = None, client_kwargs: dict = {}, **kwargs):
         self.guest = False
-        self.session = self._validate_session(email, username, password, session, **kwargs)
         self.debug = kwargs.get('debug', 0)
         self.save = kwargs.get('save', True)
         self.pbar = kwargs.get('pbar', True)
         self.out_path = Path('data')
-        self.client = self.create_client(client_kwargs)
+        self.connection = kwargs.get('connection') or ConnectionProfile()
+        archive = kwargs.get('archive')
+        self.archive = Archive(self.out_path / 'archive') if archive is True else archive
+        cache = kwargs.get('cache')
+        self.cache = Cache(self.out_path / 'cache.db') if cache is True else cache
+        checkpoints = kwargs.get('checkpoints')
+        self.checkpoints = Checkpoints(self.out_path / 'checkpoints.db') if checkpoints is True else checkpoints
+        if pool := kwargs.get('pool'):
+            # chains are spread over the pool, everything else goes through its first account
+            self.pool = pool
+            self.session, self.client, self.rate_limiter = (pool.members[0].session, pool.members[0].client,
+                                                            pool.members[0].limiter)
+        else:
+            self.session = self._validate_session(email, username, password, session, **kwargs)
+            self.client = self.create_client(client_kwargs)
+            self.rate_limiter = kwargs.get('rate_limiter') or RateLimiter()
+            self.pool = SessionPool()
+            self.pool.add(self.session, self.client, self.rate_limiter)
+        self.max_chains = kwargs.get('max_chains', 50)
+        self.retry = kwargs.get('retry') or RetryPolicy()
+        self.writer = Writer(kwargs.get('save_queue_size', 256))
+        # executor for `normalize=True`, the event loop's default thread pool if not given
+        self.normalizer: Executor | None = kwargs.get('normalizer')
+        self._loop = None
 
     def create_client(self, client_kwargs):
-        limits = Limits(max_connections=100, max_keepalive_connections=10)
         headers = self.session.headers if self.guest else get_headers(self.session)
         cookies = self.session.cookies
-        return AsyncClient(limits=limits, headers=headers, cookies=cookies, timeout=20, **client_kwargs)
+        return AsyncClient(headers=headers, cookies=cookies, **self.connection.client_kwargs() | client_kwargs)
 
     async def aclose(self):
-        return await self.client.aclose()
+        await self.writer.aclose()
+        if self.archive:
+            self.archive.close()
+        if self.cache:
+            self.cache.close()
+        if self.checkpoints:
+            self.checkpoints.close()
+        return await self.pool.aclose()
+
+    def close(self):
+        self._run_sync(self.aclose())
+        self._loop.close()
 
     def users(self, screen_names: list[str], **kwargs) -> list[dict]:
         """
@@ -51,7 +94,11 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.UserByScreenName, screen_names, **kwargs)
+        return self._run_sync(self.ausers(screen_names, **kwargs))
+
+    async def ausers(self, screen_names: list[str], **kwargs) -> list[dict]:
+        """Async counterpart of `users`."""
+        return await self._arun(Operation.UserByScreenName, screen_names, **kwargs)
 
     def tweets_by_id(self, tweet_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -61,7 +108,11 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of tweet data as dicts
         """
-        return self._run(Operation.TweetResultByRestId, tweet_ids, **kwargs)
+        return self._run_sync(self.atweets_by_id(tweet_ids, **kwargs))
+
+    async def atweets_by_id(self, tweet_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `tweets_by_id`."""
+        return await self._arun(Operation.TweetResultByRestId, tweet_ids, **kwargs)
 
     def tweets_details(self, tweet_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -73,7 +124,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of tweet data as dicts
         """
-        return self._run(Operation.TweetDetail, tweet_ids, **kwargs)
+        return self._run_sync(self.atweets_details(tweet_ids, **kwargs))
+
+    async def atweets_details(self, tweet_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `tweets_details`."""
+        return await self._arun(Operation.TweetDetail, tweet_ids, **kwargs)
+
+    def iter_tweets_details(self, tweet_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `tweets_details` pages, yielded as they arrive."""
+        return self._aiter(Operation.TweetDetail, tweet_ids, **kwargs)
 
     def tweets(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -85,7 +144,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of tweet data as dicts
         """
-        return self._run(Operation.UserTweets, user_ids, **kwargs)
+        return self._run_sync(self.atweets(user_ids, **kwargs))
+
+    async def atweets(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `tweets`."""
+        return await self._arun(Operation.UserTweets, user_ids, **kwargs)
+
+    def iter_tweets(self, user_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `tweets` pages, yielded as they arrive."""
+        return self._aiter(Operation.UserTweets, user_ids, **kwargs)
 
     def tweets_and_replies(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -97,7 +164,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of tweet data as dicts
         """
-        return self._run(Operation.UserTweetsAndReplies, user_ids, **kwargs)
+        return self._run_sync(self.atweets_and_replies(user_ids, **kwargs))
+
+    async def atweets_and_replies(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `tweets_and_replies`."""
+        return await self._arun(Operation.UserTweetsAndReplies, user_ids, **kwargs)
+
+    def iter_tweets_and_replies(self, user_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `tweets_and_replies` pages, yielded as they arrive."""
+        return self._aiter(Operation.UserTweetsAndReplies, user_ids, **kwargs)
 
     def media(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -109,7 +184,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of tweet data as dicts
         """
-        return self._run(Operation.UserMedia, user_ids, **kwargs)
+        return self._run_sync(self.amedia(user_ids, **kwargs))
+
+    async def amedia(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `media`."""
+        return await self._arun(Operation.UserMedia, user_ids, **kwargs)
+
+    def iter_media(self, user_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `media` pages, yielded as they arrive."""
+        return self._aiter(Operation.UserMedia, user_ids, **kwargs)
 
     def likes(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -121,7 +204,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of tweet data as dicts
         """
-        return self._run(Operation.Likes, user_ids, **kwargs)
+        return self._run_sync(self.alikes(user_ids, **kwargs))
+
+    async def alikes(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `likes`."""
+        return await self._arun(Operation.Likes, user_ids, **kwargs)
+
+    def iter_likes(self, user_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `likes` pages, yielded as they arrive."""
+        return self._aiter(Operation.Likes, user_ids, **kwargs)
 
     def followers(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -133,7 +224,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.Followers, user_ids, **kwargs)
+        return self._run_sync(self.afollowers(user_ids, **kwargs))
+
+    async def afollowers(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `followers`."""
+        return await self._arun(Operation.Followers, user_ids, **kwargs)
+
+    def iter_followers(self, user_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `followers` pages, yielded as they arrive."""
+        return self._aiter(Operation.Followers, user_ids, **kwargs)
 
     def following(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -145,7 +244,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.Following, user_ids, **kwargs)
+        return self._run_sync(self.afollowing(user_ids, **kwargs))
+
+    async def afollowing(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `following`."""
+        return await self._arun(Operation.Following, user_ids, **kwargs)
+
+    def iter_following(self, user_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `following` pages, yielded as they arrive."""
+        return self._aiter(Operation.Following, user_ids, **kwargs)
 
     def favoriters(self, tweet_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -157,7 +264,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.Favoriters, tweet_ids, **kwargs)
+        return self._run_sync(self.afavoriters(tweet_ids, **kwargs))
+
+    async def afavoriters(self, tweet_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `favoriters`."""
+        return await self._arun(Operation.Favoriters, tweet_ids, **kwargs)
+
+    def iter_favoriters(self, tweet_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `favoriters` pages, yielded as they arrive."""
+        return self._aiter(Operation.Favoriters, tweet_ids, **kwargs)
 
     def retweeters(self, tweet_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -169,7 +284,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.Retweeters, tweet_ids, **kwargs)
+        return self._run_sync(self.aretweeters(tweet_ids, **kwargs))
+
+    async def aretweeters(self, tweet_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `retweeters`."""
+        return await self._arun(Operation.Retweeters, tweet_ids, **kwargs)
+
+    def iter_retweeters(self, tweet_ids: list[int], **kwargs) -> AsyncGenerator[dict, None]:
+        """Async generator over `retweeters` pages, yielded as they arrive."""
+        return self._aiter(Operation.Retweeters, tweet_ids, **kwargs)
 
     def tweet_stats(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -179,7 +302,11 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of tweet statistics as dicts
         """
-        return self._run(Operation.TweetStats, user_ids, **kwargs)
+        return self._run_sync(self.atweet_stats(user_ids, **kwargs))
+
+    async def atweet_stats(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `tweet_stats`."""
+        return await self._arun(Operation.TweetStats, user_ids, **kwargs)
 
     def users_by_ids(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -191,7 +318,11 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.UsersByRestIds, batch_ids(user_ids), **kwargs)
+        return self._run_sync(self.ausers_by_ids(user_ids, **kwargs))
+
+    async def ausers_by_ids(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `users_by_ids`."""
+        return await self._arun(Operation.UsersByRestIds, batch_ids(user_ids), **kwargs)
 
     def recommended_users(self, user_ids: list[int] = None, **kwargs) -> list[dict]:
         """
@@ -201,11 +332,15 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of recommended users data as dicts
         """
+        return self._run_sync(self.arecommended_users(user_ids, **kwargs))
+
+    async def arecommended_users(self, user_ids: list[int] = None, **kwargs) -> list[dict]:
+        """Async counterpart of `recommended_users`."""
         if user_ids:
             contexts = [{"context": orjson.dumps({"contextualUserId": x}).decode()} for x in user_ids]
         else:
             contexts = [{'context': None}]
-        return self._run(Operation.ConnectTabTimeline, contexts, **kwargs)
+        return await self._arun(Operation.ConnectTabTimeline, contexts, **kwargs)
 
     def profile_spotlights(self, screen_names: list[str], **kwargs) -> list[dict]:
         """
@@ -218,7 +353,11 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.ProfileSpotlightsQuery, screen_names, **kwargs)
+        return self._run_sync(self.aprofile_spotlights(screen_names, **kwargs))
+
+    async def aprofile_spotlights(self, screen_names: list[str], **kwargs) -> list[dict]:
+        """Async counterpart of `profile_spotlights`."""
+        return await self._arun(Operation.ProfileSpotlightsQuery, screen_names, **kwargs)
 
     def users_by_id(self, user_ids: list[int], **kwargs) -> list[dict]:
         """
@@ -232,7 +371,11 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of user data as dicts
         """
-        return self._run(Operation.UserByRestId, user_ids, **kwargs)
+        return self._run_sync(self.ausers_by_id(user_ids, **kwargs))
+
+    async def ausers_by_id(self, user_ids: list[int], **kwargs) -> list[dict]:
+        """Async counterpart of `users_by_id`."""
+        return await self._arun(Operation.UserByRestId, user_ids, **kwargs)
 
     def download_media(self, ids: list[int], photos: bool = True, videos: bool = True,
                        chunk_size: int = 8192) -> None:
@@ -245,14 +388,20 @@ class Scraper:
         @param chunk_size: chunk size for download
         @return: None
         """
+        return self._run_sync(self.adownload_media(ids, photos, videos, chunk_size))
+
+    async def adownload_media(self, ids: list[int], photos: bool = True, videos: bool = True,
+                              chunk_size: int = 8192) -> None:
+        """Async counterpart of `download_media`."""
         out = Path('media')
         out.mkdir(parents=True, exist_ok=True)
-        tweets = self.tweets_by_id(ids)
+        tweets = await self.atweets_by_id(ids)
         urls = []
         for tweet in tweets:
-            tweet_id = find_key(tweet, 'id_str')[0]
+            found = find_keys(tweet, ('id_str', 'media'))
+            tweet_id = found['id_str'][0]
             url = f'https://twitter.com/i/status/{tweet_id}'
-            media = [y for x in find_key(tweet, 'media') for y in x]
+            media = [y for x in found['media'] for y in x]
             if photos:
                 photo_urls = list({u for m in media if 'ext_tw_video_thumb' not in (u := m['media_url_https'])})
                 [urls.append([url, photo]) for photo in photo_urls]
@@ -261,24 +410,22 @@ class Scraper:
                 hq_videos = {sorted(v, key=lambda d: d.get('bitrate', 0))[-1]['url'] for v in video_urls}
                 [urls.append([url, video]) for video in hq_videos]
 
-        async def process():
-            tasks = (download(self.client, x, y) for x, y in urls)
-            if self.pbar:
-                return await tqdm_asyncio.gather(*tasks, desc='Downloading media')
-            return await asyncio.gather(*tasks)
-
         async def download(client: AsyncClient, post_url: str, cdn_url: str) -> None:
             name = urlsplit(post_url).path.replace('/', '_')[1:]
             ext = urlsplit(cdn_url).path.split('/')[-1]
             try:
-                r = await client.get(cdn_url)
+                r = await self._download(client, cdn_url)
                 async with aiofiles.open(out / f'{name}_{ext}', 'wb') as fp:
                     for chunk in r.iter_bytes(chunk_size=chunk_size):
                         await fp.write(chunk)
             except Exception as e:
-                logger.error('Failed to download media: {post_url} {e}')
+                logger.error(f'Failed to download media: {post_url} {e}')
 
-        asyncio.run(process())
+        tasks = self._bounded(download(self.client, x, y) for x, y in urls)
+        if self.pbar:
+            await tqdm_asyncio.gather(*tasks, desc='Downloading media')
+        else:
+            await asyncio.gather(*tasks)
 
     def trends(self, utc: list[str] = None) -> dict:
         """
@@ -287,28 +434,29 @@ class Scraper:
         @param utc: optional list of specific UTC offsets
         @return: dict of trends
         """
+        return self._run_sync(self.atrends(utc))
+
+    async def atrends(self, utc: list[str] = None) -> dict:
+        """Async counterpart of `trends`."""
 
         async def get_trends(client: AsyncClient, offset: str, url: str):
             try:
-                client.headers['x-twitter-utcoffset'] = offset
-                r = await client.get(url)
+                r = await client.get(url, headers={'x-twitter-utcoffset': offset})
                 trends = find_key(r.json(), 'item')
                 return {t['content']['trend']['name']: t for t in trends}
             except Exception as e:
                 logger.error('Failed to get trends: %s', e)
 
-        async def process():
-            url = set_qs('https://twitter.com/i/api/2/guide.json', trending_params)
-            offsets = utc or ["-1200", "-1100", "-1000", "-0900", "-0800", "-0700", "-0600", "-0500", "-0400", "-0300",
-                              "-0200", "-0100", "+0000", "+0100", "+0200", "+0300", "+0400", "+0500", "+0600", "+0700",
-                              "+0800", "+0900", "+1000", "+1100", "+1200", "+1300", "+1400"]
-
-            tasks = (get_trends(self.client, o, url) for o in offsets)
-            if self.pbar:
-                return await tqdm_asyncio.gather(*tasks, desc='Getting trends')
-            return await asyncio.gather(*tasks)
+        url = set_qs('https://twitter.com/i/api/2/guide.json', trending_params)
+        offsets = utc or ["-1200", "-1100", "-1000", "-0900", "-0800", "-0700", "-0600", "-0500", "-0400", "-0300",
+                          "-0200", "-0100", "+0000", "+0100", "+0200", "+0300", "+0400", "+0500", "+0600", "+0700",
+                          "+0800", "+0900", "+1000", "+1100", "+1200", "+1300", "+1400"]
 
-        trends = asyncio.run(process())
+        tasks = (get_trends(self.client, o, url) for o in offsets)
+        if self.pbar:
+            trends = await tqdm_asyncio.gather(*tasks, desc='Getting trends')
+        else:
+            trends = await asyncio.gather(*tasks)
         out = self.out_path / 'raw' / 'trends'
         out.mkdir(parents=True, exist_ok=True)
         (out / f'{time.time_ns()}.json').write_text(orjson.dumps(
@@ -331,18 +479,23 @@ class Scraper:
         @param kwargs: optional keyword arguments
         @return: list of spaces data
         """
+        return self._run_sync(self.aspaces(rooms=rooms, search=search, audio=audio, chat=chat, **kwargs))
+
+    async def aspaces(self, *, rooms: list[str] = None, search: list[dict] = None, audio: bool = False,
+                      chat: bool = False, **kwargs) -> list[dict]:
+        """Async counterpart of `spaces`."""
         if rooms:
-            spaces = self._run(Operation.AudioSpaceById, rooms, **kwargs)
+            spaces = await self._arun(Operation.AudioSpaceById, rooms, **kwargs)
         else:
-            res = self._run(Operation.AudioSpaceSearch, search, **kwargs)
+            res = await self._arun(Operation.AudioSpaceSearch, search, **kwargs)
             search_results = set(find_key(res, 'rest_id'))
-            spaces = self._run(Operation.AudioSpaceById, search_results, **kwargs)
+            spaces = await self._arun(Operation.AudioSpaceById, search_results, **kwargs)
         if audio or chat:
-            return self._get_space_data(spaces, audio, chat)
+            return await self._get_space_data(spaces, audio, chat)
         return spaces
 
-    def _get_space_data(self, spaces: list[dict], audio=True, chat=True):
-        streams = self._check_streams(spaces)
+    async def _get_space_data(self, spaces: list[dict], audio=True, chat=True):
+        streams = await self._check_streams(spaces)
         chat_data = None
         if chat:
             temp = []  # get necessary keys instead of passing large dicts
@@ -355,7 +508,7 @@ class Scraper:
                         'media_key': meta['media_key'],
                         'state': meta['state'],
                     })
-            chat_data = self._get_chat_data(temp)
+            chat_data = await self._get_chat_data(temp)
         if audio:
             temp = []
             for stream in streams:
@@ -365,7 +518,7 @@ class Scraper:
                         'rest_id': stream['space']['data']['audioSpace']['metadata']['rest_id'],
                         'chunks': chunks,
                     })
-            self._download_audio(temp)
+            await self._download_audio(temp)
         return chat_data
 
     async def _get_stream(self, client: AsyncClient, media_key: str) -> dict | None:
@@ -439,7 +592,7 @@ class Scraper:
         except Exception as e:
             logger.error(f'Failed to get chunks: {e}')
 
-    def _get_chat_data(self, keys: list[dict]) -> list[dict]:
+    async def _get_chat_data(self, keys: list[dict]) -> list[dict]:
         async def get(c: AsyncClient, key: dict) -> dict:
             info = await self._init_chat(c, key['chat_token'])
             chat = await self._get_chat(c, info['endpoint'], info['access_token'])
@@ -451,31 +604,31 @@ class Scraper:
                 'info': info,
             }
 
-        async def process():
-            (self.out_path / 'raw').mkdir(parents=True, exist_ok=True)
-            tasks = (get(self.client, key) for key in keys)
-            if self.pbar:
-                return await tqdm_asyncio.gather(*tasks, desc='Downloading chat data')
-            return await asyncio.gather(*tasks)
-
-        return asyncio.run(process())
+        (self.out_path / 'raw').mkdir(parents=True, exist_ok=True)
+        tasks = self._bounded(get(self.client, key) for key in keys)
+        if self.pbar:
+            return await tqdm_asyncio.gather(*tasks, desc='Downloading chat data')
+        return await asyncio.gather(*tasks)
 
-    def _download_audio(self, data: list[dict]) -> None:
+    async def _download_audio(self, data: list[dict]) -> None:
         async def get(s: AsyncClient, chunk: str, rest_id: str) -> tuple:
-            r = await s.get(chunk)
-            return rest_id, r
-
-        async def process(data: list[dict]) -> list:
-            tasks = []
-            for d in data:
-                tasks.extend([get(self.client, chunk, d['rest_id']) for chunk in d['chunks']])
-            if self.pbar:
-                return await tqdm_asyncio.gather(*tasks, desc='Downloading audio')
-            return await asyncio.gather(*tasks)
-
-        chunks = asyncio.run(process(data))
+            try:
+                return rest_id, await self._download(s, chunk)
+            except Exception as e:
+                # a missing chunk leaves a gap in the audio, the rest of the space is still written
+                logger.error(f'Failed to download audio chunk: {chunk} {e}')
+                return rest_id, None
+
+        tasks = []
+        for d in data:
+            tasks.extend([get(self.client, chunk, d['rest_id']) for chunk in d['chunks']])
+        tasks = self._bounded(tasks)
+        if self.pbar:
+            chunks = await tqdm_asyncio.gather(*tasks, desc='Downloading audio')
+        else:
+            chunks = await asyncio.gather(*tasks)
         streams = {}
-        [streams.setdefault(_id, []).append(chunk) for _id, chunk in chunks]
+        [streams.setdefault(_id, []).append(chunk) for _id, chunk in chunks if chunk is not None]
         # ensure chunks are in correct order
         for k, v in streams.items():
             streams[k] = sorted(v, key=lambda x: int(re.findall('_(\d+)_\w\.aac$', x.url.path)[0]))
@@ -486,88 +639,344 @@ class Scraper:
             with open(out / f'{space_id}.aac', 'wb') as fp:
                 [fp.write(c.content) for c in chunks]
 
-    def _check_streams(self, keys: list[dict]) -> list[dict]:
+    async def _check_streams(self, keys: list[dict]) -> list[dict]:
         async def get(c: AsyncClient, space: dict) -> dict:
             media_key = space['data']['audioSpace']['metadata']['media_key']
             stream = await self._get_stream(c, media_key)
             return {'space': space, 'stream': stream}
 
-        async def process():
-            return await asyncio.gather(*(get(self.client, key) for key in keys))
+        return await asyncio.gather(*(get(self.client, key) for key in keys))
 
-        return asyncio.run(process())
+    def _bounded(self, coros) -> list:
+        """
+        Wrap coroutines so at most `max_connections` of them run at once, leaving no request waiting on the pool.
+        """
+        sem = asyncio.Semaphore(self.connection.max_connections)
 
-    def _run(self, operation: tuple[dict, str, str], queries: set | list[int | str | dict], **kwargs):
-        keys, qid, name = operation
-        # stay within rate-limits
-        if (l := len(queries)) > 500:
-            logger.warning(f'Got {l} queries, truncating to first 500.')
-            queries = list(queries)[:500]
+        async def run(coro):
+            async with sem:
+                return await coro
 
-        if all(isinstance(q, dict) for q in queries):
-            data = asyncio.run(self._process(operation, list(queries), **kwargs))
-            return get_json(data, **kwargs)
+        return [run(c) for c in coros]
 
-        # queries are of type set | list[int|str], need to convert to list[dict]
-        _queries = [{k: q} for q in queries for k, v in keys.items()]
-        res = asyncio.run(self._process(operation, _queries, **kwargs))
+    async def _download(self, client: AsyncClient, url: str) -> Response:
+        """
+        Get a media or audio file, retrying transport errors (timeouts, `PoolTimeout`, ...) and server errors
+        with backoff according to `self.retry`.
+        """
+        budget = self.retry.new_budget()
+        attempt = 0
+        while True:
+            try:
+                r = await client.get(url)
+            except TransportError as e:
+                if not budget.allow('download', type(e).__name__, attempt):
+                    raise
+            else:
+                if r.status_code not in self.retry.statuses:
+                    return r
+                if not budget.allow('download', str(r.status_code), attempt):
+                    return r
+            await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    def _run_sync(self, coro):
+        """
+        Run a coroutine to completion on the scraper's own event loop.
+
+        The loop is created once and reused by every blocking call, so the shared `AsyncClient`
+        keeps its connection pool between calls. Do not mix blocking calls with the async API
+        (`ausers`, `atweets`, ...) on the same instance, as the client is bound to the loop it first ran on.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+
+        async def run():
+            try:
+                return await coro
+            finally:
+                # blocking calls return only once their saved pages are on disk
+                await self.writer.flush()
+
+        return self._loop.run_until_complete(run())
+
+    async def _arun(self, operation: tuple[dict, str, str], queries: set | list[int | str | dict], **kwargs):
+        is_dicts = all(isinstance(q, dict) for q in queries)
+        res = await self._process(operation, self._build_queries(operation, queries), **kwargs)
+        if kwargs.get('normalize'):
+            # models of each query, in query order
+            return res.pop() if kwargs.get('cursor') else flatten(res)
         data = get_json(res, **kwargs)
+        if is_dicts:
+            return data
         return data.pop() if kwargs.get('cursor') else flatten(data)
 
-    async def _query(self, client: AsyncClient, operation: tuple, **kwargs) -> Response:
+    @staticmethod
+    def _build_queries(operation: tuple[dict, str, str], queries: set | list[int | str | dict]) -> list[dict]:
+        keys, qid, name = operation
+        if all(isinstance(q, dict) for q in queries):
+            return list(queries)
+
+        # queries are of type set | list[int|str], need to convert to list[dict]
+        return [{k: q} for q in queries for k, v in keys.items()]
+
+    async def _query(self, member: Member, operation: tuple, budget: Budget = None,
+                     **kwargs) -> tuple[Response, dict]:
+        """
+        Request a single page, returning the response together with its body decoded once.
+
+        The decoded body is shared by everything downstream (cursor extraction, dedup, the returned results),
+        and saving writes the raw bytes, so nothing decodes or re-encodes the page again.
+
+        With a cache, fresh cached responses are returned without touching the network or the rate limit.
+        The lookup runs on a worker thread, so SQLite reads (and waits on a running eviction) never block the loop.
+        Server errors and transport failures are retried with backoff while the chain's `budget` allows.
+        """
         keys, qid, name = operation
+        variables = Operation.default_variables | keys | kwargs
         params = {
-            'variables': Operation.default_variables | keys | kwargs,
+            'variables': variables,
             'features': Operation.default_features,
         }
-        r = await client.get(f'https://twitter.com/i/api/graphql/{qid}/{name}', params=build_params(params))
+        url = f'https://twitter.com/i/api/graphql/{qid}/{name}'
+        key = None
+        if self.cache and self.cache.ttl_for(name) is not None:
+            key = self.cache.key(qid, name, variables)
+            if (content := await asyncio.to_thread(self.cache.get, key)) is not None:
+                logger.debug(f'{name}: cache hit')
+                r = Response(200, content=content, headers={'content-type': 'application/json'},
+                             request=Request('GET', url))
+                # saved like any other page, so `save=True` output does not depend on what was cached
+                await self._save(name, kwargs, content)
+                return r, orjson.loads(content)
+        budget = budget or self.retry.new_budget()
+        attempt = 0
+        while True:
+            await member.limiter.acquire(name)
+            try:
+                r = await member.client.get(url, params=build_params(params))
+            except TransportError as e:
+                member.limiter.release(name)
+                reason = 'timeout' if isinstance(e, TimeoutException) else type(e).__name__
+                if not budget.allow(name, reason, attempt):
+                    raise
+            except Exception:
+                member.limiter.release(name)
+                raise
+            else:
+                member.limiter.update(name, r)
+                self.pool.inspect(member, r)
+                if r.status_code not in self.retry.statuses or not budget.allow(name, str(r.status_code), attempt):
+                    break
+            await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+        try:
+            data = orjson.loads(r.content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f'{name}: cannot parse {r.status_code} response: {e}')
+            return r, {}
         if self.debug:
             logger.debug(r)
-        if self.save:
-            save_json(r, self.out_path, name, **kwargs)
-        return r
+        if key and r.status_code == 200 and not data.get('errors'):
+            await self.writer.submit(self.cache.set, key, name, r.content)
+        await self._save(name, kwargs, r.content)
+        return r, data
+
+    async def _save(self, name: str, kwargs: dict, content: bytes) -> None:
+        if self.save and self.archive:
+            query = {k: v for k, v in kwargs.items() if k != 'cursor'}
+            await self.writer.submit(self.archive.write, name, query, kwargs.get('cursor'), content)
+        elif self.save:
+            await self.writer.put(get_save_path(self.out_path, name, **kwargs), content)
 
     async def _process(self, operation: tuple, queries: list[dict], **kwargs):
-        tasks = (self._paginate(self.client, operation, **q, **kwargs) for q in queries)
-        if self.pbar:
-            return await tqdm_asyncio.gather(*tasks, desc=operation[-1])
-        return await asyncio.gather(*tasks)
+        res = [None] * len(queries)
+        pbar = tqdm_asyncio(total=len(queries), desc=operation[-1]) if self.pbar else None
+        try:
+            async for i, r in self._schedule(operation, queries, lambda q: self._paginate(operation, **q, **kwargs)):
+                res[i] = r
+                if pbar:
+                    pbar.update()
+        finally:
+            if pbar:
+                pbar.close()
+        return res
+
+    async def _schedule(self, operation: tuple, queries: list[dict], fn: Callable) -> AsyncGenerator[tuple[int, any], None]:
+        """
+        Run `fn` over any number of queries, yielding `(index, result)` as each one finishes.
+
+        At most `max_chains` pagination chains are in flight at once. Once the operation's rate-limit budget is known,
+        the window shrinks to what that budget can serve, so queries are started in waves rather than all at once.
+        """
+        name = operation[-1]
+        queue = iter(enumerate(queries))
+        running = {}
+        try:
+            while True:
+                width = self.max_chains
+                if (budget := self.pool.capacity(name)) is not None:
+                    width = max(1, min(width, budget))
+                while len(running) < width and (item := next(queue, None)):
+                    i, q = item
+                    running[asyncio.create_task(fn(q))] = i
+                if not running:
+                    return
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    yield running.pop(t), t.result()
+        finally:
+            for t in running:
+                t.cancel()
+
+    async def _aiter(self, operation: tuple, queries: set | list[int | str | dict], **kwargs) -> AsyncGenerator[dict, None]:
+        """
+        Run every query's cursor chain through the scheduler and yield parsed pages as they arrive.
+
+        Producers hand pages over through a single-slot queue, so at most one page per running chain is held in memory.
+        Pages from different queries are interleaved in arrival order.
+        """
+        queue = asyncio.Queue(maxsize=1)
+        done = object()
+
+        async def produce(q: dict):
+            async for _, data, _ in self._chain(operation, **q, **kwargs):
+                await queue.put(data)
+
+        async def run():
+            try:
+                async for _ in self._schedule(operation, self._build_queries(operation, queries), produce):
+                    ...
+            except Exception as e:
+                await queue.put(e)
+            await queue.put(done)
+
+        task = asyncio.create_task(run())
+        try:
+            while (item := await queue.get()) is not done:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+
+    async def _chain(self, operation: tuple, **kwargs) -> AsyncGenerator[tuple, None]:
+        """
+        Follow a single cursor chain, yielding `(response, data, next_cursor)` for each page as it arrives.
 
-    async def _paginate(self, client: AsyncClient, operation: tuple, **kwargs):
+        The chain is pinned to the pool account that started it, and only moves if that account gets retired.
+        With checkpoints, the chain continues from its last recorded cursor unless one is given explicitly,
+        and yields nothing if it already finished.
+        """
+        name = operation[-1]
         limit = kwargs.pop('limit', math.inf)
         cursor = kwargs.pop('cursor', None)
-        is_resuming = False
         dups = 0
         DUP_LIMIT = 3
-        if cursor:
-            is_resuming = True
-            res = []
-            ids = set()
-        else:
-            r = await self._query(client, operation, **kwargs)
-            initial_data = r.json()
-            res = [r]
-            # ids = get_ids(initial_data, operation) # todo
-            ids = set(find_key(initial_data, 'rest_id'))
-            cursor = get_cursor(initial_data)
-        while (dups < DUP_LIMIT) and cursor:
-            prev_len = len(ids)
-            if prev_len >= limit:
-                break
-            r = await self._query(client, operation, cursor=cursor, **kwargs)
-            data = r.json()
-            cursor = get_cursor(data)
-            # ids |= get_ids(data, operation) # todo
-            ids |= set(find_key(data, 'rest_id'))
-            if self.debug:
-                logger.debug(f'Unique results: {len(ids)}\tcursor: {cursor}')
-            if prev_len == len(ids):
-                dups += 1
-            res.append(r)
+        ids = set()
+        budget = self.retry.new_budget()
+        if self.checkpoints and not cursor:
+            cursor, done, ids = self.checkpoints.load(name, kwargs)
+            if done:
+                logger.debug(f'{name}: {kwargs} already finished, skipping')
+                return
+        member = await self.pool.checkout()
+
+        async def checkpoint(r: Response, new_ids: set, done: bool) -> None:
+            # error pages carry no cursor, they must not mark the chain as finished
+            if self.checkpoints and r.is_success:
+                # queued behind the page's own save, so a checkpoint never gets ahead of the saved pages
+                await self.writer.submit(self.checkpoints.save, name, kwargs, cursor, new_ids, done)
+
+        async def fetch(**variables) -> tuple[Response, dict]:
+            nonlocal member
+            attempt = 0
+            while True:
+                r, data = await self._query(member, operation, budget, **variables)
+                if member.healthy:
+                    return r, data
+                if r.status_code == 429:
+                    if not budget.allow(name, '429', attempt):
+                        return r, data
+                    attempt += 1
+                # account was retired by this response, hand the chain over and retry the page,
+                # checkout waits for the rate-limit window to reset if no other account is available
+                self.pool.checkin(member)
+                member = await self.pool.checkout()
+
+        try:
+            if not cursor:
+                r, data = await fetch(**kwargs)
+                # ids = get_ids(data, operation) # todo
+                new_ids = set(find_key(data, 'rest_id')) - ids
+                ids |= new_ids
+                cursor = get_cursor(data)
+                await checkpoint(r, new_ids, not cursor)
+                yield r, data, cursor
+            while (dups < DUP_LIMIT) and cursor:
+                prev_len = len(ids)
+                if prev_len >= limit:
+                    break
+                r, data = await fetch(cursor=cursor, **kwargs)
+                cursor = get_cursor(data)
+                # ids |= get_ids(data, operation) # todo
+                new_ids = set(find_key(data, 'rest_id')) - ids
+                ids |= new_ids
+                if self.debug:
+                    logger.debug(f'Unique results: {len(ids)}\tcursor: {cursor}')
+                if prev_len == len(ids):
+                    dups += 1
+                await checkpoint(r, new_ids, not cursor or dups >= DUP_LIMIT)
+                yield r, data, cursor
+        finally:
+            self.pool.checkin(member)
+
+    async def _paginate(self, operation: tuple, **kwargs):
+        """
+        Collect a cursor chain's pages.
+
+        With `normalize`, the chain's `Tweet`s and `User`s are returned instead. Each page is handed to
+        the `normalizer` as soon as it arrives and is normalized while the next one downloads, so a chain takes
+        about as long as the slower of fetching and normalizing rather than both. At most one page per chain is
+        normalized at a time, which keeps pages from piling up when normalizing is the bottleneck.
+        """
+        normalize = kwargs.pop('normalize', False)
+        is_resuming = bool(cursor := kwargs.get('cursor'))
+        res = []
+        users = {}  # authors shared by the chain's pages
+        pending = None
+        try:
+            async for r, data, cursor in self._chain(operation, **kwargs):
+                if not normalize:
+                    res.append(data)
+                    continue
+                if pending:
+                    res.extend(await pending)
+                pending = asyncio.ensure_future(self._normalize(r, data, users))
+            if pending:
+                res.extend(await pending)
+        finally:
+            if pending:
+                pending.cancel()
         if is_resuming:
             return res, cursor
         return res
 
+    async def _normalize(self, r: Response, data: dict, users: dict) -> list:
+        """
+        Normalize a page on the `normalizer`.
+
+        Worker processes get the raw response body, which is much cheaper to send than the decoded page,
+        and build their own authors. Threads share the chain's `users`.
+        """
+        if not data:
+            # unparseable response, already logged by `_query`
+            return []
+        loop = asyncio.get_running_loop()
+        if isinstance(self.normalizer, ProcessPoolExecutor):
+            return await loop.run_in_executor(self.normalizer, _normalize_chunk, [r.content], False)
+        return await loop.run_in_executor(self.normalizer, _normalize_page, data, users)
+
         async def get_chunks(client: AsyncClient, url: str) -> list[str]:
             try:
                 url = URL(url)
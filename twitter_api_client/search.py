@@ -3,22 +3,29 @@ import logging
 import math
 import platform
 import random
+import re
 import time
+from datetime import datetime, timezone
 from logging import Logger
 from pathlib import Path
 
 import orjson
 from httpx import AsyncClient, Client
 
+from .connection import ConnectionProfile
 from .constants import *
 from .login import login
 from .util import set_qs, get_headers, find_key
+from .writer import Writer
 
 reset = '\u001b[0m'
 colors = [f'\u001b[{i}m' for i in range(30, 38)]
 
 logger = logging.getLogger(__name__)
 
+# earliest date worth searching when a sharded query has no `since:`
+TWITTER_EPOCH = datetime(2006, 3, 21, tzinfo=timezone.utc).timestamp()
+
 try:
     if get_ipython().__class__.__name__ == 'ZMQInteractiveShell':
         import nest_asyncio
@@ -42,24 +49,114 @@ class Search:
         self.api = 'https://api.twitter.com/2/search/adaptive.json?'
         self.save = kwargs.get('save', True)
         self.debug = kwargs.get('debug', 0)
-        self.client = AsyncClient(headers=get_headers(self.session), **client_kwargs)
+        self.connection = kwargs.get('connection') or ConnectionProfile()
+        self.client = AsyncClient(headers=get_headers(self.session), **self.connection.client_kwargs() | client_kwargs)
+        self.writer = Writer(kwargs.get('save_queue_size', 256))
+        self.max_inflight = kwargs.get('max_inflight', 16)
+        self._inflight = None
 
     async def aclose(self):
+        await self.writer.aclose()
         return await self.client.aclose()
 
     def run(self, *args, out: str = 'data', **kwargs):
         out_path = self.make_output_dirs(out)
-        if kwargs.get('latest', False):
-            search_config['tweet_search_mode'] = 'live'
-        return asyncio.run(self.process(args, search_config, out_path, **kwargs))
+        config = search_config | ({'tweet_search_mode': 'live'} if kwargs.get('latest', False) else {})
+        return asyncio.run(self.process(args, config, out_path, **kwargs))
 
     async def process(self, queries: tuple, config: dict, out: Path, **kwargs) -> list:
-        return await asyncio.gather(*(self.paginate(q, self.client, config, out, **kwargs) for q in queries))
+        try:
+            if kwargs.get('shards'):
+                return await asyncio.gather(*(self.shard(q, config, out, **kwargs) for q in queries))
+            return await asyncio.gather(*(self.paginate(q, self.client, config, out, **kwargs) for q in queries))
+        finally:
+            await self.writer.flush()
 
     async def paginate(self, query: str, session: AsyncClient, config: dict, out: Path, **kwargs) -> list[dict]:
-        config['q'] = query
+        return [data async for data in self._pages(query, session, config, out, **kwargs)]
+
+    async def shard(self, query: str, config: dict, out: Path, shards: int = 8, **kwargs) -> list[dict]:
+        """
+        Paginate a single query as concurrent time slices, merging the pages with duplicate tweets removed.
+
+        The query's range (its `since:`/`until:` operators, or the `since`/`until` arguments) is split into
+        `shards` equal slices, searched with `since_time:`/`until_time:`. For latest (time-ordered) results,
+        a slice still going after `split_pages` pages is dense, so its remaining range is split in two
+        and requeued, keeping every worker busy until the whole range is covered.
+
+        @param query: search query
+        @param shards: number of slices searched at once
+        @param since: start of the range, a date (`YYYY-MM-DD`) or unix timestamp, overrides `since:`
+        @param until: end of the range, a date (`YYYY-MM-DD`) or unix timestamp, overrides `until:`
+        @param split_pages: pages after which a dense slice is split
+        @param min_span: seconds below which a slice is never split
+        @return: pages, each with only the tweets not already returned in another page.
+            A slice that fails is logged and left out, the other slices are still searched.
+        """
+        query, since, until = split_time_range(query, kwargs.pop('since', None), kwargs.pop('until', None))
+        adaptive = config.get('tweet_search_mode') == 'live'
+        split_pages = kwargs.pop('split_pages', 10)
+        min_span = kwargs.pop('min_span', 60 * 60)
+        limit = kwargs.get('limit', math.inf)
+        step = (until - since) / shards
+        slices = asyncio.Queue()
+        for i in range(shards):
+            slices.put_nowait((since + i * step, since + (i + 1) * step))
+        seen, results = set(), []
+
+        async def search(lo: float, hi: float):
+            q = f'{query} since_time:{int(lo)} until_time:{math.ceil(hi)}'
+            pages = 0
+            async for data in self._pages(q, self.client, config, out, **kwargs):
+                if not data:
+                    continue
+                pages += 1
+                tweets = data['globalObjects']['tweets']
+                data['globalObjects']['tweets'] = {k: v for k, v in tweets.items() if k not in seen}
+                seen.update(tweets)
+                results.append(data)
+                if len(seen) >= limit:
+                    # drop the slices not started yet, the running ones stop after their current page
+                    while not slices.empty():
+                        slices.get_nowait()
+                        slices.task_done()
+                    return
+                if adaptive and pages >= split_pages and tweets:
+                    oldest = min(created_at(t) for t in tweets.values())
+                    if oldest - lo >= 2 * min_span:
+                        # this slice covers [oldest, hi) so far, split what is left
+                        mid = (lo + oldest) / 2
+                        if self.debug:
+                            logger.debug(f'{query}: splitting dense slice at {datetime.fromtimestamp(mid)}')
+                        slices.put_nowait((lo, mid))
+                        slices.put_nowait((mid, oldest + 1))
+                        return
+
+        async def worker():
+            while True:
+                lo, hi = await slices.get()
+                try:
+                    await search(lo, hi)
+                except Exception as e:
+                    # keep the worker alive for the remaining slices, a dead worker would leave `join` waiting
+                    logger.error(f'{query}: failed to search {datetime.fromtimestamp(lo)} - '
+                                 f'{datetime.fromtimestamp(hi)}: {type(e).__name__}: {e}')
+                finally:
+                    slices.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(shards)]
+        try:
+            await slices.join()
+        finally:
+            for w in workers:
+                w.cancel()
+        return results
+
+    async def _pages(self, query: str, session: AsyncClient, config: dict, out: Path, **kwargs):
+        # request state is per query, `config` is shared by every query of a run
+        config = {k: v for k, v in config.items() if k != 'cursor'} | {'q': query}
         data, next_cursor = await self.backoff(lambda: self.get(session, config), query, **kwargs)
-        all_data = [data]
+        yield data
         c = colors.pop() if colors else ''
         ids = set()
         while next_cursor:
@@ -68,24 +165,21 @@ class Search:
                 if self.debug:
                     logger.debug(
                         f'Returned {len(ids)} search results for {query}')
-                return all_data
+                return
             if self.debug:
                 logger.debug(f'{query}')
             config['cursor'] = next_cursor
 
             data, next_cursor = await self.backoff(lambda: self.get(session, config), query, **kwargs)
             if not data:
-                return all_data
+                return
 
             data['query'] = query
 
             if self.save:
-                (out / f'raw/{time.time_ns()}.json').write_text(
-                    orjson.dumps(data, option=orjson.OPT_INDENT_2).decode(),
-                    encoding='utf-8'
-                )
-            all_data.append(data)
-        return all_data
+                await self.writer.put(out / f'raw/{time.time_ns()}.json',
+                                      orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            yield data
 
     async def backoff(self, fn, info, **kwargs):
         retries = kwargs.get('retries', 3)
@@ -104,15 +198,26 @@ class Search:
                 if self.debug:
                     logger.debug(
                         f'No data for: {info}, retrying in {f"{t:.2f}"} seconds: {e}')
-                time.sleep(t)
+                await asyncio.sleep(t)
 
     async def get(self, session: AsyncClient, params: dict) -> tuple:
         url = set_qs(self.api, params, update=True, safe='()')
-        r = await session.get(url)
-        data = r.json()
+        async with self._limit():
+            r = await session.get(url)
+        data = orjson.loads(r.content)
         next_cursor = self.get_cursor(data)
         return data, next_cursor
 
+    def _limit(self) -> asyncio.Semaphore:
+        """
+        Semaphore capping the search requests in flight across all queries.
+        One is made per event loop, as every call to `run` starts a new loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._inflight is None or self._inflight[0] is not loop:
+            self._inflight = loop, asyncio.Semaphore(self.max_inflight)
+        return self._inflight[1]
+
     def get_cursor(self, res: dict):
         try:
             if live := find_key(res, 'value'):
@@ -149,3 +254,30 @@ class Search:
             return login(email, username, password, **kwargs)
         raise Exception('Session not authenticated. '
                         'Please use an authenticated session or remove the `session` argument and try again.')
+
+
+def split_time_range(query: str, since: str | float = None, until: str | float = None) -> tuple[str, float, float]:
+    """
+    Remove the `since:`/`until:` (or `since_time:`/`until_time:`) operators from a query.
+
+    @return: the remaining query, and the range as unix timestamps
+    """
+    bounds = {}
+    for op, value in re.findall(r'\b(since|until)(?:_time)?:(\S+)', query):
+        bounds[op] = value
+    query = re.sub(r'\s*\b(?:since|until)(?:_time)?:\S+', '', query).strip()
+    since = to_timestamp(since or bounds.get('since') or TWITTER_EPOCH)
+    until = to_timestamp(until or bounds.get('until') or time.time())
+    if since >= until:
+        raise Exception(f'Empty time range for {query!r}: {since} >= {until}')
+    return query, since, until
+
+
+def to_timestamp(value: str | float) -> float:
+    if isinstance(value, str) and not value.isdigit():
+        return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
+    return float(value)
+
+
+def created_at(tweet: dict) -> float:
+    return datetime.strptime(tweet['created_at'], '%a %b %d %H:%M:%S %z %Y').timestamp()
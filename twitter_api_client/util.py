@@ -8,7 +8,7 @@ from urllib.parse import urlsplit, urlencode, urlunsplit, parse_qs, quote
 import orjson
 from httpx import Response, Client
 
-from .constants import GREEN, MAGENTA, RED, RESET, ID_MAP
+from .constants import GREEN, MAGENTA, RED, RESET, ID_MAP, INSTRUCTION_PATHS
 
 
 log_ = logging.getLogger(__name__)
@@ -57,16 +57,22 @@ def build_params(params: dict) -> dict:
 
 
 def save_json(r: Response, path: Path, name: str, **kwargs):
+    """
+    Save the raw response body as-is, it must already be known to be valid JSON
+    """
     try:
-        data = r.json()
-        kwargs.pop('cursor', None)
-        out = path / '_'.join(map(str, kwargs.values()))
-        out.mkdir(parents=True, exist_ok=True)
-        (out / f'{time.time_ns()}_{name}.json').write_bytes(orjson.dumps(data))
+        out = get_save_path(path, name, **kwargs)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_bytes(r.content)
     except Exception as e:
         print(f'Failed to save data: {e}')
 
 
+def get_save_path(path: Path, name: str, **kwargs) -> Path:
+    kwargs.pop('cursor', None)
+    return path / '_'.join(map(str, kwargs.values())) / f'{time.time_ns()}_{name}.json'
+
+
 def flatten(seq: list | tuple) -> list:
     flat = []
     for e in seq:
@@ -77,7 +83,7 @@ def flatten(seq: list | tuple) -> list:
     return flat
 
 
-def get_json(res: list[Response], **kwargs) -> list:
+def get_json(res: list[Response | dict], **kwargs) -> list:
     cursor = kwargs.get('cursor')
     temp = res
     if any(isinstance(r, (list, tuple)) for r in res):
@@ -85,7 +91,8 @@ def get_json(res: list[Response], **kwargs) -> list:
     results = []
     for r in temp:
         try:
-            data = r.json()
+            # pages decoded upstream are passed through untouched
+            data = r if isinstance(r, dict) else r.json()
             if cursor:
                 results.append([data, cursor])
             else:
@@ -102,16 +109,52 @@ def set_qs(url: str, qs: dict, update=False, **kwargs) -> str:
 
 
 def get_cursor(data: list | dict) -> str:
+    """
+    Get the bottom cursor of a GraphQL timeline response.
+
+    Checks the `TimelineAddEntries` and `TimelineReplaceEntry` instructions at their known locations first,
+    and only searches the whole response if none of them match (i.e. the schema has changed).
+    """
+    if (instructions := get_timeline_instructions(data)) is not None:
+        entries = []
+        replaced = []
+        for instruction in instructions:
+            if e := instruction.get('entries'):
+                entries = e
+            elif e := instruction.get('entry'):
+                replaced.append(e)
+        return get_bottom_cursor(entries) or get_bottom_cursor(replaced)
+    return find_cursor(data)
+
+
+def find_cursor(data: list | dict) -> str:
     # inefficient, but need to deal with arbitrary schema
     entries = find_key(data, 'entries')
     if entries:
-        for entry in entries.pop():
-            entry_id = entry.get('entryId', '')
-            if ('cursor-bottom' in entry_id) or ('cursor-showmorethreads' in entry_id):
-                content = entry['content']
-                if itemContent := content.get('itemContent'):
-                    return itemContent['value']  # v2 cursor
-                return content['value']  # v1 cursor
+        return get_bottom_cursor(entries.pop())
+
+
+def get_bottom_cursor(entries: list[dict]) -> str:
+    for entry in entries:
+        entry_id = entry.get('entryId', '')
+        if ('cursor-bottom' in entry_id) or ('cursor-showmorethreads' in entry_id):
+            content = entry['content']
+            if itemContent := content.get('itemContent'):
+                return itemContent['value']  # v2 cursor
+            return content['value']  # v1 cursor
+
+
+def get_timeline_instructions(data: list | dict) -> list | None:
+    if not isinstance(data, dict) or not isinstance(inner := data.get('data'), dict):
+        return
+    for path in INSTRUCTION_PATHS:
+        node = inner
+        for key in path:
+            if not isinstance(node, dict) or (node := node.get(key)) is None:
+                break
+        else:
+            if isinstance(node, list):
+                return node
 
 
 def get_headers_from_cookies(cookies: dict, headers={}, **kwargs) -> dict:
@@ -137,7 +180,7 @@ def get_headers(session, **kwargs) -> dict:
     """
     Get the headers required for authenticated requests
     """
-    return get_headers_from_cookies(dict(session.cookie), **kwargs)
+    return get_headers_from_cookies(dict(session.cookies), **kwargs)
 
 
 def find_key(obj: any, key: str) -> list:
@@ -147,41 +190,53 @@ def find_key(obj: any, key: str) -> list:
     Most data of interest is nested, and sometimes defined by different schemas.
     It is not worth our time to enumerate all absolute paths to a given key, then update
     the paths in our parsing functions every time Twitter changes their API.
-    Instead, we recursively search for the key here, then run post-processing functions on the results.
+    Instead, we search for the key here, then run post-processing functions on the results.
 
     @param obj: dictionary or list of dictionaries
     @param key: key to search for
     @return: list of values
     """
+    return find_keys(obj, (key,))[key]
 
-    def helper(obj: any, key: str, L: list) -> list:
-        if not obj:
-            return L
-
-        if isinstance(obj, list):
-            for e in obj:
-                L.extend(helper(e, key, []))
-            return L
 
-        if isinstance(obj, dict) and obj.get(key):
-            L.append(obj[key])
+def find_keys(obj: any, keys: set[str] | tuple[str, ...]) -> dict[str, list]:
+    """
+    Find all values of several keys within a nested dict or list of dicts in a single pass
 
-        if isinstance(obj, dict) and obj:
-            for k in obj:
-                L.extend(helper(obj[k], key, []))
-        return L
+    Walks the structure once, depth-first, with an explicit stack of iterators instead of recursion,
+    so no intermediate lists are built. Values are collected in the same order as `find_key`,
+    and only truthy values are kept.
 
-    return helper(obj, key, [])
+    @param obj: dictionary or list of dictionaries
+    @param keys: keys to search for
+    @return: dict of key to list of values
+    """
+    found = {k: [] for k in keys}
+    stack = [iter((obj,))]
+    while stack:
+        for node in stack[-1]:
+            if isinstance(node, dict):
+                for k in keys:
+                    if v := node.get(k):
+                        found[k].append(v)
+                stack.append(iter(node.values()))
+                break
+            if isinstance(node, list):
+                stack.append(iter(node))
+                break
+        else:
+            stack.pop()
+    return found
 
 
-def log(logger: Logger, level: int, r: Response):
-    def stat(r, txt, data):
+def log(logger: Logger, level: int, r: Response, data: dict = None):
+    def stat(r, data):
         if level >= 1:
             logger.debug(f'{r.url.path}')
         if level >= 2:
             logger.debug(f'{r.url}')
         if level >= 3:
-            logger.debug(f'{txt}')
+            logger.debug(f'{r.text}')
         if level >= 4:
             logger.debug(f'{data}')
 
@@ -198,16 +253,17 @@ def log(logger: Logger, level: int, r: Response):
 
     try:
         status = r.status_code
-        txt, data, = r.text, r.json()
         if 'json' in r.headers.get('content-type', ''):
+            if data is None:
+                data = orjson.loads(r.content)
             if data.get('errors') and not find_key(data, 'instructions'):
                 logger.error(f'[{RED}error{RESET}] {status} {data}')
             else:
                 logger.debug(fmt_status(status))
-                stat(r, txt, data)
+                stat(r, data)
         else:
             logger.debug(fmt_status(status))
-            stat(r, txt, {})
+            stat(r, {})
     except Exception as e:
         logger.error(f'Failed to log: {e}')
 
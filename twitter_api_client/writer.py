@@ -0,0 +1,82 @@
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Writer:
+    """
+    Write files from a dedicated thread so disk latency never stalls the event loop.
+
+    At most `maxsize` writes can be pending; once the queue is full, `put` waits for the writer thread
+    to catch up, so memory stays bounded without blocking other coroutines.
+    Writes run one at a time in submission order, and are flushed by `flush`/`aclose`, and at interpreter exit.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._queue = queue.Queue()
+        self._thread = None
+        self._loop = None
+        self._slots = None
+        self._dirs = set()
+
+    async def put(self, path: Path, content: bytes) -> None:
+        await self.submit(self._write, path, content)
+
+    async def submit(self, fn: Callable, *args) -> None:
+        """
+        Queue `fn(*args)` to run on the writer thread.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._slots = loop, asyncio.Semaphore(self.maxsize)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._drain, name='writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        await self._slots.acquire()
+        self._queue.put((fn, args, loop, self._slots))
+
+    async def flush(self) -> None:
+        """
+        Wait until every pending write is on disk.
+        """
+        await asyncio.to_thread(self._queue.join)
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        atexit.unregister(self.close)
+
+    def _drain(self) -> None:
+        while (item := self._queue.get()) is not None:
+            fn, args, loop, slots = item
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.error(f'Failed to save data: {e}')
+            finally:
+                self._queue.task_done()
+                try:
+                    loop.call_soon_threadsafe(slots.release)
+                except RuntimeError:
+                    ...  # loop already closed, nobody is waiting on it
+        self._queue.task_done()
+
+    def _write(self, path: Path, content: bytes) -> None:
+        if path.parent not in self._dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(path.parent)
+        path.write_bytes(content)